@@ -9,18 +9,172 @@ encapsulando a lógica de conexão, envio de mensagens e manipulação de evento
 """
 
 import asyncio
-import base64
-import json
 import logging
-import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Callable, AsyncGenerator
 
 from openai import AsyncOpenAI
 
-from src.utils.config import load_config
+from src.api.realtime_events import (
+    APPEND_CHUNK_SIZE,
+    AUDIO_COMMIT_EVENT,
+    KNOWN_BENIGN_ERRORS,
+    RESPONSE_CANCEL_EVENT,
+    RESPONSE_CREATE_EVENT,
+    decode_audio,
+    drain_server_events,
+    iter_audio_append_events,
+    session_update_event,
+)
+from src.utils.config import get_realtime_config
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1)
+def get_async_openai(api_key: str) -> AsyncOpenAI:
+    """
+    Obtém um cliente AsyncOpenAI compartilhado para a chave de API informada.
+    
+    O cliente é criado uma única vez e reaproveitado entre as rodadas da
+    conversa, mantendo o pool de conexões HTTP e o contexto SSL.
+    
+    Args:
+        api_key: Chave de API da OpenAI
+    
+    Returns:
+        Cliente AsyncOpenAI
+    """
+    return AsyncOpenAI(api_key=api_key)
+
+
+@dataclass
+class _EventState:
+    """
+    Estado acumulado por `OpenAIRealtimeClient.process_events` durante uma resposta.
+    """
+    on_audio_chunk: Optional[Callable[[bytes, str], None]] = None
+    on_text_chunk: Optional[Callable[[str], None]] = None
+    on_error: Optional[Callable[[Dict[str, Any]], None]] = None
+    # Eventos tratados; o total recebido é retornado por drain_server_events
+    event_count: int = 0
+    audio_delta_count: int = 0
+    text_delta_count: int = 0
+    total_audio_bytes: int = 0
+    # Trechos de texto, unidos apenas no final
+    text_parts: List[str] = field(default_factory=list)
+    last_audio_item_id: Optional[str] = None
+    completed: bool = False
+
+
+def _on_audio_delta(event: Any, state: _EventState) -> bool:
+    """
+    Decodifica um trecho de áudio da resposta e o repassa imediatamente.
+    
+    Args:
+        event: Evento response.audio.delta (do SDK ou lido direto do frame)
+        state: Estado da resposta
+    
+    Returns:
+        False, para continuar recebendo eventos
+    """
+    state.event_count += 1
+    
+    # O delta é uma string base64 com um trecho de áudio PCM16
+    delta = event.delta
+    if not delta:
+        return False
+    
+    audio_data = decode_audio(delta)
+    if not audio_data:
+        return False
+    
+    state.audio_delta_count += 1
+    state.total_audio_bytes += len(audio_data)
+    state.last_audio_item_id = event.item_id
+    
+    # Repassar o chunk sem acumular a resposta em memória, para que a
+    # reprodução comece enquanto os deltas ainda chegam
+    if state.on_audio_chunk:
+        state.on_audio_chunk(audio_data, event.item_id)
+    return False
+
+
+def _on_error(event: Any, state: _EventState) -> bool:
+    """
+    Trata eventos de erro, ignorando os erros conhecidos como não críticos.
+    
+    Args:
+        event: Evento de erro recebido
+        state: Estado da resposta
+    
+    Returns:
+        False, pois erros não encerram o recebimento da resposta
+    """
+    state.event_count += 1
+    
+    error = event.error
+    if error is not None and error.code in KNOWN_BENIGN_ERRORS:
+        logger.debug("Ignorando erro conhecido: %s", error.code)
+        return False
+    
+    # Exibir outros erros que podem ser importantes
+    logger.error("Erro na API: %s", error)
+    
+    if state.on_error:
+        state.on_error({"error": error})
+    return False
+
+
+def _on_text_delta(event: Any, state: _EventState) -> bool:
+    """
+    Acumula um trecho de texto da resposta e o repassa ao callback.
+    
+    Args:
+        event: Evento response.text.delta
+        state: Estado da resposta
+    
+    Returns:
+        False, para continuar recebendo eventos
+    """
+    state.event_count += 1
+    
+    delta = event.delta
+    if delta:
+        state.text_delta_count += 1
+        state.text_parts.append(delta)
+        
+        if state.on_text_chunk:
+            state.on_text_chunk(delta)
+    return False
+
+
+def _on_response_done(event: Any, state: _EventState) -> bool:
+    """
+    Marca a resposta como concluída.
+    
+    Args:
+        event: Evento response.done
+        state: Estado da resposta
+    
+    Returns:
+        True, para encerrar o recebimento de eventos
+    """
+    state.event_count += 1
+    state.completed = True
+    return True
+
+
+# Tratadores por tipo de evento. Cada tratador retorna True para encerrar o loop.
+_EVENT_HANDLERS: Dict[str, Callable[[Any, _EventState], bool]] = {
+    "response.audio.delta": _on_audio_delta,
+    "error": _on_error,
+    "response.text.delta": _on_text_delta,
+    "response.done": _on_response_done,
+}
+
+
 class OpenAIRealtimeClient:
     """
     Cliente para comunicação com a API Realtime do OpenAI.
@@ -36,16 +190,18 @@ class OpenAIRealtimeClient:
         Args:
             api_key: Chave de API da OpenAI (opcional, se não fornecida será buscada na configuração)
         """
-        config = load_config()
-        self.api_key = api_key or config.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY"))
+        config = get_realtime_config()
+        self.api_key = api_key or config.api_key
         
         if not self.api_key:
             logger.error("Chave de API da OpenAI não encontrada")
             raise ValueError("Chave de API da OpenAI é necessária")
             
-        self.client = AsyncOpenAI(api_key=self.api_key)
-        self.model = config.get("openai", {}).get("model", "gpt-4o-realtime-preview")
+        # Cliente compartilhado entre instâncias com a mesma chave
+        self.client = get_async_openai(self.api_key)
+        self.model = config.model
         self.connection = None
+        self.response_active = False
         
     async def connect(self) -> None:
         """
@@ -80,16 +236,14 @@ class OpenAIRealtimeClient:
             
         logger.debug(f"Configurando sessão: voz={voice}, formato={output_format}")
         
-        await self.connection.session.update(session={
-            'modalities': modalities,
-            'instructions': instructions,
-            'voice': voice,
-            'output_audio_format': output_format
-        })
+        # Evento montado uma única vez por configuração de sessão
+        await self.connection.send(
+            session_update_event(instructions, voice, output_format, tuple(modalities))
+        )
         
         logger.debug("Sessão configurada com sucesso")
         
-    async def send_audio(self, audio_data: bytes, chunk_size: int = 4096) -> None:
+    async def send_audio(self, audio_data: bytes, chunk_size: int = APPEND_CHUNK_SIZE) -> None:
         """
         Envia áudio para a API Realtime.
         
@@ -100,30 +254,24 @@ class OpenAIRealtimeClient:
         if not self.connection:
             raise RuntimeError("Conexão não estabelecida. Chame connect() primeiro.")
             
-        # Dividir o áudio em chunks menores para envio
-        audio_chunks = [audio_data[i:i+chunk_size] for i in range(0, len(audio_data), chunk_size)]
-        
-        logger.debug(f"Enviando {len(audio_chunks)} chunks de áudio para a API...")
+        logger.debug(f"Enviando {len(audio_data)} bytes de áudio para a API...")
         
-        # Tentar cancelar qualquer resposta ativa anterior
-        try:
-            await self.connection.send({"type": "response.cancel"})
-            await asyncio.sleep(0.5)  # Pequena pausa para garantir que o cancelamento seja processado
-        except Exception as e:
-            # Ignorar erros de cancelamento - pode não haver resposta ativa para cancelar
-            logger.debug(f"Aviso ao cancelar resposta: {e}")
-            
-        # Enviar chunks de áudio para a API
-        for chunk in audio_chunks:
-            base64_audio = base64.b64encode(chunk).decode('ascii')
+        # Cancelar a resposta anterior apenas se ela ainda estiver ativa.
+        # O servidor processa os eventos do cliente em ordem, então não é preciso
+        # aguardar a confirmação do cancelamento antes de enviar o novo áudio.
+        if self.response_active:
+            try:
+                await self.connection.send(RESPONSE_CANCEL_EVENT)
+            except Exception as e:
+                logger.debug(f"Aviso ao cancelar resposta: {e}")
+            self.response_active = False
             
-            await self.connection.send({
-                "type": "input_audio_buffer.append",
-                "audio": base64_audio
-            })
+        # Enviar o áudio em chunks (codificado em base64 de uma só vez)
+        for append_event in iter_audio_append_events(audio_data, chunk_size):
+            await self.connection.send(append_event)
             
         # Finalizar entrada de áudio
-        await self.connection.send({"type": "input_audio_buffer.commit"})
+        await self.connection.send(AUDIO_COMMIT_EVENT)
         logger.debug("Áudio enviado com sucesso")
         
     async def request_response(self) -> None:
@@ -133,7 +281,8 @@ class OpenAIRealtimeClient:
         if not self.connection:
             raise RuntimeError("Conexão não estabelecida. Chame connect() primeiro.")
             
-        await self.connection.send({"type": "response.create"})
+        await self.connection.send(RESPONSE_CREATE_EVENT)
+        self.response_active = True
         logger.debug("Solicitação de resposta enviada")
         
     async def process_events(self, 
@@ -155,111 +304,39 @@ class OpenAIRealtimeClient:
         """
         if not self.connection:
             raise RuntimeError("Conexão não estabelecida. Chame connect() primeiro.")
-            
-        # Contadores para estatísticas
-        event_count = 0
-        audio_delta_count = 0
-        text_delta_count = 0
-        total_audio_bytes = 0
-        text_response = ""
-        last_audio_item_id = None
         
-        # Processar eventos da resposta
-        while True:
-            try:
-                event = await self.connection.recv()
-            except asyncio.CancelledError:
-                logger.warning("Processamento de eventos interrompido")
-                break
-            except Exception as e:
-                logger.error(f"Erro ao processar eventos: {e}")
-                break
-            
-            event_count += 1
-            
-            # Processa cada tipo de evento
-            event_type = getattr(event, 'type', None)
-            
-            # Verificar erros
-            if event_type == "error":
-                # Ignorar erros específicos que sabemos que não são críticos
-                error_message = getattr(event, 'error', None)
-                if error_message:
-                    error_code = getattr(error_message, 'code', '')
-                    
-                    # Ignorar erros conhecidos
-                    if any(code in str(error_code) for code in 
-                          ['conversation_already_has_active_response', 
-                           'input_audio_buffer_commit_empty',
-                           'response_cancel_not_active']):
-                        logger.debug(f"Ignorando erro conhecido: {error_code}")
-                        continue
-                
-                # Exibir outros erros que podem ser importantes
-                logger.error(f"Erro na API: {error_message}")
-                
-                if on_error:
-                    on_error({"error": error_message})
-                    
-                continue
-            
-            # Processar eventos de texto
-            if event_type == "response.text_delta":
-                delta = getattr(event, 'delta', None)
-                if delta:
-                    text_delta_count += 1
-                    text_response += delta
-                    
-                    if on_text_chunk:
-                        on_text_chunk(delta)
-            
-            # Processar eventos de áudio
-            elif event_type == "response.audio_delta":
-                delta = getattr(event, 'delta', None)
-                item_id = getattr(event, 'item_id', None)
-                
-                if delta and delta.get('base64_audio'):
-                    audio_delta_count += 1
-                    
-                    # Decodificar o áudio
-                    audio_data = base64.b64decode(delta['base64_audio'])
-                    total_audio_bytes += len(audio_data)
-                    last_audio_item_id = item_id
-                    
-                    if on_audio_chunk:
-                        on_audio_chunk(audio_data, item_id)
-            
-            # Processar evento de fim da resposta
-            elif event_type == "response.done":
-                logger.debug(f"Resposta concluída: {event_count} eventos, {audio_delta_count} chunks de áudio, {text_delta_count} chunks de texto")
-                
-                result = {
-                    "text": text_response,
-                    "events": event_count,
-                    "audio_chunks": audio_delta_count,
-                    "text_chunks": text_delta_count,
-                    "total_audio_bytes": total_audio_bytes,
-                    "last_audio_item_id": last_audio_item_id
-                }
-                
-                if on_finish:
-                    on_finish(result)
-                    
-                return result
-                
-        # Retornar resultados parciais se o loop for interrompido sem evento done
-        logger.warning("Processamento de eventos interrompido sem evento de conclusão")
+        # Estado da resposta, repassado aos tratadores de cada tipo de evento
+        state = _EventState(on_audio_chunk, on_text_chunk, on_error)
+        
+        # Processar eventos da resposta com o loop de despacho compartilhado
+        # (deltas de áudio são lidos direto do frame, sem o parser do SDK)
+        try:
+            event_count = await drain_server_events(self.connection, _EVENT_HANDLERS, state)
+        except asyncio.CancelledError:
+            logger.warning("Processamento de eventos interrompido")
+            event_count = state.event_count
+        except Exception as e:
+            logger.error(f"Erro ao processar eventos: {e}")
+            event_count = state.event_count
         
         result = {
-            "text": text_response,
+            "text": "".join(state.text_parts),
             "events": event_count,
-            "audio_chunks": audio_delta_count,
-            "text_chunks": text_delta_count,
-            "total_audio_bytes": total_audio_bytes,
-            "last_audio_item_id": last_audio_item_id,
-            "completed": False
+            "audio_chunks": state.audio_delta_count,
+            "text_chunks": state.text_delta_count,
+            "total_audio_bytes": state.total_audio_bytes,
+            "last_audio_item_id": state.last_audio_item_id
         }
         
+        if state.completed:
+            self.response_active = False
+            logger.debug("Resposta concluída: %d eventos, %d chunks de áudio, %d chunks de texto",
+                         event_count, state.audio_delta_count, state.text_delta_count)
+        else:
+            # Retornar resultados parciais se o loop for interrompido sem evento done
+            logger.warning("Processamento de eventos interrompido sem evento de conclusão")
+            result["completed"] = False
+        
         if on_finish:
             on_finish(result)
             
@@ -272,3 +349,4 @@ class OpenAIRealtimeClient:
         
         logger.debug("Conexão fechada")
         self.connection = None
+        self.response_active = False
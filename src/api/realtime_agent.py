@@ -12,32 +12,269 @@ Agora com gravação inteligente que detecta quando o usuário para de falar!
 """
 
 import asyncio
-import base64
-import json
+import atexit
 import logging
-import os
 import sys
-import time
-from typing import Dict, List, Optional, Any, Callable
-
-# Importações de terceiros
-import numpy as np
-import pyaudio
-from openai import AsyncOpenAI
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Any
 
+from src.api.openai_client import get_async_openai
+from src.api.realtime_events import (
+    APPEND_CHUNK_SIZE,
+    AUDIO_COMMIT_EVENT,
+    KNOWN_BENIGN_ERRORS,
+    RESPONSE_CANCEL_EVENT,
+    RESPONSE_CREATE_EVENT,
+    audio_append_event,
+    decode_audio,
+    drain_server_events,
+    encode_audio,
+    session_update_event,
+)
 # Importação do reprodutor de áudio em tempo real
 from src.audio.player_realtime import AudioPlayerRealtime
 from src.audio.smart_recorder import SmartRecorder
-from src.utils.config import load_config
+from src.utils.config import RealtimeConfig, get_realtime_config
 
 # Configuração básica de logging
 logger = logging.getLogger(__name__)
 
+# Duração mínima de áudio agrupada em cada evento de append durante a gravação.
+# Como a resposta só é pedida após o commit, janelas maiores não atrasam a
+# resposta e reduzem o número de frames enviados pelo WebSocket.
+STREAM_APPEND_SECONDS = 1.0
+
+# Executor para as operações de áudio bloqueantes (parar reprodução e gravação),
+# fora do event loop. Um único worker preserva a ordem das operações.
+_audio_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-io")
+
+# Reprodutor compartilhado entre as rodadas, para manter o stream de saída aberto
+_audio_player: Optional[AudioPlayerRealtime] = None
+
+
+def _get_audio_player(config: RealtimeConfig) -> AudioPlayerRealtime:
+    """
+    Obtém o reprodutor de áudio compartilhado, criando-o na primeira chamada.
+    
+    O stream de saída do reprodutor é aberto uma única vez e reaproveitado nas
+    rodadas seguintes, evitando a configuração do dispositivo a cada resposta.
+    
+    Args:
+        config: Configuração da API Realtime (taxa de amostragem e dispositivo de saída)
+    
+    Returns:
+        Reprodutor de áudio em tempo real
+    """
+    global _audio_player
+    
+    player = _audio_player
+    if (player is None
+            or player.sample_rate != config.sample_rate
+            or player.device != config.output_device
+            or player.latency != config.output_latency):
+        if player is not None:
+            player.close()
+        _audio_player = AudioPlayerRealtime(
+            sample_rate=config.sample_rate,
+            device=config.output_device,
+            latency=config.output_latency,
+        )
+        atexit.register(_audio_player.close)
+        
+    return _audio_player
+
+
+@dataclass
+class _ResponseState:
+    """
+    Estado acumulado durante o recebimento de uma resposta.
+    """
+    audio_player: AudioPlayerRealtime
+    event_count: int = 0
+    audio_delta_count: int = 0
+    text_delta_count: int = 0
+    total_audio_bytes: int = 0
+    # Trechos de texto da resposta, unidos apenas no final
+    text_parts: List[str] = field(default_factory=list)
+    last_audio_item_id: Optional[str] = None
+    # Deltas de áudio aguardando decodificação (None encerra o worker)
+    audio_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+def _on_error(event: Any, state: _ResponseState) -> bool:
+    """
+    Trata eventos de erro, ignorando os erros conhecidos como não críticos.
+    
+    Args:
+        event: Evento de erro recebido
+        state: Estado da resposta
+    
+    Returns:
+        False, pois erros não encerram o recebimento da resposta
+    """
+    error = event.error
+    
+    # Ignorar erros conhecidos (resposta ativa, buffer vazio, cancelamento)
+    if error is not None and error.code in KNOWN_BENIGN_ERRORS:
+        logger.debug("Ignorando erro conhecido: %s", error.code)
+        return False
+    
+    # Exibir outros erros que podem ser importantes
+    logger.error("Erro na API: %s", error)
+    return False
+
+
+def _on_text_delta(event: Any, state: _ResponseState) -> bool:
+    """
+    Acumula um trecho de texto da resposta.
+    
+    Args:
+        event: Evento response.text.delta
+        state: Estado da resposta
+    
+    Returns:
+        False, para continuar recebendo eventos
+    """
+    state.text_delta_count += 1
+    try:
+        state.text_parts.append(event.delta)
+    except AttributeError:
+        pass
+    return False
+
+
+def _on_audio_delta(event: Any, state: _ResponseState) -> bool:
+    """
+    Enfileira um trecho de áudio da resposta para o worker de decodificação.
+    
+    O leitor do WebSocket apenas repassa o evento; a decodificação base64 e o
+    envio ao reprodutor ficam com `_audio_worker`.
+    
+    Args:
+        event: Evento response.audio.delta (do SDK ou lido direto do frame)
+        state: Estado da resposta
+    
+    Returns:
+        False, para continuar recebendo eventos
+    """
+    state.audio_delta_count += 1
+    state.audio_queue.put_nowait(event)
+    return False
+
+
+async def _audio_worker(state: _ResponseState) -> None:
+    """
+    Decodifica os deltas de áudio enfileirados e os envia ao reprodutor.
+    
+    Termina ao receber None na fila, sinalizando ao reprodutor que não
+    chegarão mais trechos da resposta.
+    
+    Args:
+        state: Estado da resposta
+    """
+    audio_player = state.audio_player
+    
+    while True:
+        event = await state.audio_queue.get()
+        if event is None:
+            # Todo o áudio já chegou: tocar o que houver sem esperar o buffer mínimo
+            audio_player.mark_input_complete()
+            return
+        
+        try:
+            # Verificar se temos um novo item de áudio (nova resposta)
+            item_id = event.item_id
+            if item_id and item_id != state.last_audio_item_id:
+                # Se mudou o item_id, resetar o contador de frames
+                audio_player.reset_frame_count()
+                state.last_audio_item_id = item_id
+            
+            # Obter os dados de áudio base64
+            audio_base64 = event.delta
+            if not audio_base64:
+                continue
+                
+            # Decodificar os dados de Base64
+            chunk_data = decode_audio(audio_base64)
+            
+            # Pular chunks vazios
+            if len(chunk_data) == 0:
+                continue
+            
+            # Adicionar o chunk ao reprodutor de áudio em tempo real
+            audio_player.add_audio_chunk(chunk_data)
+            
+            # Estatísticas
+            state.total_audio_bytes += len(chunk_data)
+            
+        except Exception as e:
+            logger.error(f"Erro ao processar áudio: {e}")
+
+
+def _on_response_done(event: Any, state: _ResponseState) -> bool:
+    """
+    Finaliza o recebimento da resposta.
+    
+    Args:
+        event: Evento response.done
+        state: Estado da resposta
+    
+    Returns:
+        True, para encerrar o recebimento de eventos
+    """
+    logger.debug("Evento final recebido.")
+    return True
+
+
+# Tratadores por tipo de evento. Cada tratador retorna True para encerrar o loop.
+_RESPONSE_HANDLERS: Dict[str, Callable[[Any, _ResponseState], bool]] = {
+    "error": _on_error,
+    "response.text.delta": _on_text_delta,
+    "response.audio.delta": _on_audio_delta,
+    "response.done": _on_response_done,
+}
+
+
+async def _tick_every(interval: float) -> None:
+    """
+    Escreve um ponto no terminal a cada intervalo, como feedback de progresso.
+    
+    Args:
+        interval: Intervalo em segundos entre cada ponto
+    """
+    while True:
+        await asyncio.sleep(interval)
+        sys.stdout.write(".")
+        sys.stdout.flush()
+
+
+async def _wait_playback_complete(audio_player: AudioPlayerRealtime) -> None:
+    """
+    Aguarda até que o reprodutor termine de tocar todo o áudio recebido.
+    
+    O fim é sinalizado pelo próprio callback do stream de áudio, sem polling.
+    
+    Args:
+        audio_player: Reprodutor de áudio em tempo real
+    """
+    loop = asyncio.get_running_loop()
+    finished = asyncio.Event()
+    
+    audio_player.set_playback_complete_callback(
+        lambda: loop.call_soon_threadsafe(finished.set)
+    )
+    try:
+        await finished.wait()
+    finally:
+        audio_player.set_playback_complete_callback(None)
+
+
 async def process_audio_request(recorder: Optional[SmartRecorder] = None) -> Dict[str, Any]:
     """
     Processa uma solicitação de áudio completa:
     1. Grava áudio do microfone com detecção inteligente de silêncio
-    2. Envia para a API Realtime
+    2. Envia cada trecho para a API Realtime enquanto ainda está gravando
     3. Reproduz a resposta em tempo real conforme os chunks são recebidos
     
     Args:
@@ -48,240 +285,175 @@ async def process_audio_request(recorder: Optional[SmartRecorder] = None) -> Dic
     """
 
     # Obter a chave de API
-    config = load_config()
+    config = get_realtime_config()
 
-    # Instanciar o reprodutor de áudio em tempo real
-    audio_player = AudioPlayerRealtime(sample_rate=config.get("audio", {}).get("sample_rate", 24000))
+    # Obter o reprodutor de áudio em tempo real (compartilhado entre rodadas)
+    audio_player = _get_audio_player(config)
     
-    api_key = config.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY"))
+    api_key = config.api_key
     
     if not api_key:
         logger.error("Chave de API da OpenAI não encontrada na configuração")
         return {}
     
-    # Inicializar cliente OpenAI
-    client = AsyncOpenAI(api_key=api_key)
+    # Obter o cliente OpenAI (compartilhado entre rodadas)
+    client = get_async_openai(api_key)
     
     # Inicializar o gravador inteligente ou usar o passado por parâmetro
-    audio_buffer = bytearray()
-    recording_completed = asyncio.Event()
+    audio_data = b""
     own_recorder = False
     
-    # Callback quando a gravação for concluída
-    def on_recording_complete(audio_data: bytes):
-        nonlocal audio_buffer
-        audio_buffer.extend(audio_data)
-        recording_completed.set()
+    # Chunks gravados, repassados do thread de gravação ao event loop.
+    # None sinaliza que a gravação foi concluída.
+    loop = asyncio.get_running_loop()
+    chunk_queue: asyncio.Queue = asyncio.Queue()
+    
+    # Callback para cada chunk gravado (chamado no thread de gravação)
+    def on_audio_chunk(chunk: bytes):
+        loop.call_soon_threadsafe(chunk_queue.put_nowait, chunk)
+    
+    # Callback quando a gravação for concluída (chamado no thread de gravação)
+    def on_recording_complete(recorded_audio: bytes):
+        nonlocal audio_data
+        audio_data = recorded_audio
+        loop.call_soon_threadsafe(chunk_queue.put_nowait, None)
     
     # Usar o gravador fornecido ou criar um novo
     if recorder is None:
-        recorder = SmartRecorder(sample_rate=config.get("audio", {}).get("sample_rate", 24000))
+        recorder = SmartRecorder(sample_rate=config.sample_rate)
         own_recorder = True
     
-    # Iniciar gravação inteligente
-    recorder.start_recording(on_recording_complete)
+    # Conexão com a API (definida dentro do bloco try)
+    connection = None
     
     try:
-        # Aguardar até que a gravação seja concluída
-        await recording_completed.wait()
-        
-        # Converter para bytes
-        audio_data = bytes(audio_buffer)
-        
-        # Verificar se temos dados de áudio
-        if len(audio_data) == 0:
-            logger.error("Nenhum dado de áudio foi capturado")
-            return {}
-            
-        # Informações para debug
-        audio_duration = len(audio_data) / (config.get("audio", {}).get("sample_rate", 24000) * config.get("audio", {}).get("channels", 1) * 2)  # Duração em segundos
-        logger.debug(f"Áudio capturado: {len(audio_data)} bytes ({audio_duration:.2f}s)")
-    
         print("Conectando à API Realtime...")
         
-        # Conectar à API
-        async with client.beta.realtime.connect(model="gpt-4o-realtime-preview") as connection:
+        # Conectar à API antes de gravar, para enviar o áudio enquanto é capturado
+        async with client.beta.realtime.connect(model=config.model) as connection:
             print("Conexão estabelecida!")
             
-            # Obter a personalidade do assistente da configuração
-            personality = config.get("assistant", {}).get("personality", 
-                "Você é o Turrão, um assistente com personalidade forte e irreverente. "
-                "Responda com humor ácido e sarcasmo.")
+            # Obter a personalidade e a voz do assistente da configuração
+            personality = config.personality
+            voice = config.voice
 
             print(f"personalidade do assistente: {personality}")
-            print(f"voz do assistente: {config.get("assistant", {}).get("voice", "alloy")}")
+            print(f"voz do assistente: {voice}")
             
-            # Configurar a sessão
-            await connection.session.update(session={
-                'modalities': ['audio', 'text'],
-                'instructions': personality,
-                'voice': config.get("assistant", {}).get("voice", "alloy"),  
-                'output_audio_format': 'pcm16'
-            })
+            # Configurar a sessão (evento montado uma única vez por configuração)
+            await connection.send(session_update_event(personality, voice))
             print("Sessão configurada!")
             
-            # Dividir o audio em chunks menores para envio
-            chunk_size = 4096
-            audio_chunks = [audio_data[i:i+chunk_size] for i in range(0, len(audio_data), chunk_size)]
-            total_chunks = len(audio_chunks)
+            # A conexão é nova a cada rodada, então não há resposta ativa a cancelar.
+            # Se o servidor ainda assim acusar uma resposta ativa, o erro
+            # conversation_already_has_active_response é tratado no loop de eventos.
             
-            print("Enviando áudio para a API...")
+            # Estado da resposta (contadores e texto acumulado)
+            state = _ResponseState(audio_player)
+            
+            # Worker que decodifica o áudio fora do loop de leitura do WebSocket
+            audio_worker = asyncio.create_task(_audio_worker(state))
+            
+            # Receber os eventos do servidor em paralelo ao envio do áudio, para
+            # que nenhum evento fique parado no WebSocket enquanto ainda gravamos
+            # e a resposta comece a tocar assim que o primeiro delta chegar
+            receiver = asyncio.create_task(
+                drain_server_events(connection, _RESPONSE_HANDLERS, state)
+            )
             
-            # Verificar se já existe uma resposta ativa 
             try:
-                # Tentar cancelar qualquer resposta ativa anterior
-                await connection.send({"type": "response.cancel"})
-                await asyncio.sleep(0.5)  # Pequena pausa para garantir que o cancelamento seja processado
-            except Exception as e:
-                # Ignorar erros de cancelamento - pode não haver resposta ativa para cancelar
-                logger.debug(f"Aviso ao cancelar resposta: {e}")
+                # Iniciar gravação inteligente
+                recorder.start_recording(on_recording_complete, on_audio_chunk)
                 
-            # Enviar chunks de áudio para a API
-            for i, chunk in enumerate(audio_chunks):
-                base64_audio = base64.b64encode(chunk).decode('ascii')
+                # Enviar o áudio enquanto é gravado, agrupando os chunks em janelas de
+                # STREAM_APPEND_SECONDS para codificar e enviar menos eventos
+                bytes_per_append = min(
+                    int(config.sample_rate * config.channels * 2 * STREAM_APPEND_SECONDS),
+                    APPEND_CHUNK_SIZE,
+                )
+                pending_audio = bytearray()
                 
-                await connection.send({
-                    "type": "input_audio_buffer.append",
-                    "audio": base64_audio
-                })
-                
-                if i % 10 == 0 or i == total_chunks - 1:
-                    sys.stdout.write(".")
-                    sys.stdout.flush()
-            
-            # Finalizar entrada de áudio
-            await connection.send({"type": "input_audio_buffer.commit"})
-            print("\nÁudio enviado!")
-            
-            # Solicitar resposta
-            await connection.send({"type": "response.create"})
-            print("Aguardando resposta...")
-            
-            # Contadores para estatísticas
-            event_count = 0
-            audio_delta_count = 0
-            text_delta_count = 0
-            total_audio_bytes = 0
-            text_response = ""
-            last_audio_item_id = None
-            
-            # Processar eventos da resposta
-            async for event in connection:
-                event_count += 1
+                while True:
+                    chunk = await chunk_queue.get()
+                    if chunk is None:
+                        break
+                    
+                    pending_audio += chunk
+                    if len(pending_audio) < bytes_per_append:
+                        continue
+                    
+                    await connection.send(audio_append_event(encode_audio(pending_audio)))
+                    pending_audio.clear()
                 
-                # Processa cada tipo de evento
-                event_type = getattr(event, 'type', None)
+                # Enviar o restante do áudio gravado
+                if pending_audio:
+                    await connection.send(audio_append_event(encode_audio(pending_audio)))
                 
-                # Verificar erros
-                if event_type == "error":
-                    # Ignorar erros específicos que sabemos que não são críticos
-                    error_message = getattr(event, 'error', None)
-                    if error_message:
-                        error_code = getattr(error_message, 'code', '')
-                        
-                        # Ignorar erro de "conversation_already_has_active_response"
-                        if 'conversation_already_has_active_response' in str(error_code):
-                            logger.debug("Ignorando erro de resposta ativa já existente")
-                            continue
-                            
-                        # Ignorar erro de buffer muito pequeno se já enviamos todo o áudio
-                        if 'input_audio_buffer_commit_empty' in str(error_code):
-                            logger.debug("Ignorando erro de buffer vazio - já processamos o áudio disponível")
-                            continue
-                            
-                        # Ignorar erro de "sem resposta ativa para cancelar"
-                        if 'response_cancel_not_active' in str(error_code):
-                            logger.debug("Ignorando erro de cancelamento - não havia resposta ativa")
-                            continue
+                # Verificar se temos dados de áudio
+                if len(audio_data) == 0:
+                    logger.error("Nenhum dado de áudio foi capturado")
+                    return {}
                     
-                    # Exibir outros erros que podem ser importantes
-                    logger.error(f"Erro na API: {error_message}")
-                    continue
+                # Informações para debug
+                audio_duration = len(audio_data) / (config.sample_rate * config.channels * 2)  # Duração em segundos
+                logger.debug(f"Áudio capturado: {len(audio_data)} bytes ({audio_duration:.2f}s)")
+                
+                # Finalizar entrada de áudio
+                await connection.send(AUDIO_COMMIT_EVENT)
+                print("Áudio enviado!")
                 
-                # Processar eventos de texto
-                if event_type == "response.text.delta":
-                    text_delta_count += 1
-                    if hasattr(event, 'delta'):
-                        text_response += event.delta
+                # Solicitar resposta
+                await connection.send(RESPONSE_CREATE_EVENT)
+                print("Aguardando resposta...")
                 
-                # Processar especificamente os eventos de áudio delta
-                elif event_type == "response.audio.delta":
+                # Aguardar o fim da resposta (deltas de áudio lidos direto do frame)
+                state.event_count = await receiver
+            finally:
+                # Interromper o recebimento se o envio terminou sem resposta
+                if not receiver.done():
+                    receiver.cancel()
                     try:
-                        audio_delta_count += 1
-                        
-                        # Verificar se temos um novo item de áudio (nova resposta)
-                        item_id = getattr(event, 'item_id', None)
-                        if item_id and item_id != last_audio_item_id:
-                            # Se mudou o item_id, resetar o contador de frames
-                            audio_player.reset_frame_count()
-                            last_audio_item_id = item_id
-                        
-                        # Obter os dados de áudio base64
-                        audio_base64 = None
-                        
-                        if hasattr(event, 'delta'):
-                            audio_base64 = event.delta
-                        
-                        if not audio_base64:
-                            continue
-                            
-                        # Decodificar os dados de Base64
-                        chunk_data = base64.b64decode(audio_base64)
-                        
-                        # Pular chunks vazios
-                        if len(chunk_data) == 0:
-                            continue
-                        
-                        # Adicionar o chunk ao reprodutor de áudio em tempo real
-                        audio_player.add_audio_chunk(chunk_data)
-                        
-                        # Estatísticas
-                        total_audio_bytes += len(chunk_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Erro ao processar áudio: {e}")
+                        await receiver
+                    except asyncio.CancelledError:
+                        pass
                 
-                # Finalização da resposta
-                elif event_type == "response.done":
-                    logger.debug("Evento final recebido.")
-                    break
+                # Encerrar o worker depois que todo o áudio pendente for decodificado
+                state.audio_queue.put_nowait(None)
+                await audio_worker
             
             print("\nResposta concluída!")
             
-            print(f"\nTotal de eventos de áudio recebidos: {audio_delta_count} (Total: {total_audio_bytes} bytes)")
+            print(f"\nTotal de eventos de áudio recebidos: {state.audio_delta_count} (Total: {state.total_audio_bytes} bytes)")
             
             # Garantir que todo o áudio tenha sido reproduzido
-            if audio_delta_count > 0:
+            if state.audio_delta_count > 0:
                 print("Aguardando finalização da reprodução do áudio...")
                 
-                # Usar o novo método mais confiável para detectar o fim da reprodução
+                # Aguardar o aviso de fim da reprodução vindo do callback do stream
                 max_wait_time = 30  # 30 segundos como tempo máximo de segurança
-                start_wait = time.time()
                 
-                while not audio_player.is_playing_complete() and (time.time() - start_wait < max_wait_time):
-                    await asyncio.sleep(0.1)
-                    
-                    # Feedback periódico para mostrar que ainda está processando
-                    if (time.time() - start_wait) % 3 < 0.1:  # A cada ~3 segundos
-                        sys.stdout.write(".")
-                        sys.stdout.flush()
+                # Feedback periódico para mostrar que ainda está processando
+                ticker = asyncio.create_task(_tick_every(3))
                 
-                # Se excedeu o timeout, avisar mas continuar
-                if time.time() - start_wait >= max_wait_time:
-                    print("\nTempo limite de segurança excedido. Finalizando mesmo assim.")
-                else:
+                try:
+                    await asyncio.wait_for(_wait_playback_complete(audio_player), timeout=max_wait_time)
                     print("\nReprodução concluída com sucesso!")
+                except asyncio.TimeoutError:
+                    # Se excedeu o timeout, avisar mas continuar
+                    print("\nTempo limite de segurança excedido. Finalizando mesmo assim.")
+                finally:
+                    ticker.cancel()
             
             # Parar o reprodutor de áudio após a reprodução completa
-            audio_player.stop_playback()
+            await loop.run_in_executor(_audio_io_executor, audio_player.stop_playback)
             
             # Retornar informações sobre a operação
             return {
                 "success": True,
-                "audio_events": audio_delta_count,
-                "text_events": text_delta_count,
-                "total_audio_bytes": total_audio_bytes,
-                "text_response": text_response
+                "audio_events": state.audio_delta_count,
+                "text_events": state.text_delta_count,
+                "total_audio_bytes": state.total_audio_bytes,
+                "text_response": "".join(state.text_parts)
             }
     
     except Exception as e:
@@ -291,8 +463,8 @@ async def process_audio_request(recorder: Optional[SmartRecorder] = None) -> Dic
         
         # Tentar cancelar a resposta (ignorar erros)
         try:
-            if 'connection' in locals():
-                await connection.send({"type": "response.cancel"})
+            if connection is not None:
+                await connection.send(RESPONSE_CANCEL_EVENT)
         except Exception as cancel_error:
             # Ignorar especificamente erros de "no active response found"
             if "no active response found" in str(cancel_error).lower():
@@ -301,8 +473,8 @@ async def process_audio_request(recorder: Optional[SmartRecorder] = None) -> Dic
                 logger.error(f"Erro ao cancelar resposta: {cancel_error}")
         
         # Sempre parar o reprodutor de áudio em caso de erro
-        if 'audio_player' in locals():
-            audio_player.stop_playback()
+        if audio_player is not None:
+            await loop.run_in_executor(_audio_io_executor, audio_player.stop_playback)
             
         return {
             "success": False,
@@ -310,8 +482,8 @@ async def process_audio_request(recorder: Optional[SmartRecorder] = None) -> Dic
         }
     finally:
         # Parar o gravador apenas se foi criado aqui
-        if own_recorder and 'recorder' in locals():
-            recorder.stop_recording()
+        if own_recorder:
+            await loop.run_in_executor(_audio_io_executor, recorder.stop_recording)
 
 
 async def run_agent(recorder: Optional[SmartRecorder] = None) -> Dict[str, Any]:
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Construção e leitura de eventos da API Realtime da OpenAI.
+
+Este módulo concentra a montagem dos eventos enviados pelo cliente e a
+leitura dos eventos recebidos do servidor:
+
+- Os eventos enviados são dicionários simples, repassados a
+  `connection.send`, que os serializa e envia pelo WebSocket.
+- Todo o áudio de uma gravação é codificado em base64 de uma só vez e o texto
+  resultante é fatiado em eventos, em vez de codificar cada trecho separadamente.
+- A codificação e a decodificação base64 usam o pybase64 (SIMD) quando
+  disponível, com fallback para a biblioteca padrão.
+- Os eventos de formato constante (commit, criação e cancelamento de resposta)
+  e a configuração da sessão são montados uma única vez e reutilizados.
+- Os eventos `response.audio.delta` recebidos, que são a grande maioria das
+  mensagens de uma resposta, são lidos diretamente do frame bruto do
+  WebSocket: o campo `delta` é exposto como uma `memoryview` sobre o frame,
+  sem passar pelo `json.loads` nem pela construção do modelo do SDK. Os demais
+  eventos (ou frames em formato inesperado) seguem pelo parser do SDK.
+"""
+
+import binascii
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Mapping, NamedTuple, Optional, Tuple, Union
+
+from websockets.exceptions import ConnectionClosedOK
+
+# Importação condicional para pybase64 (base64 acelerado com SIMD)
+try:
+    import pybase64
+    HAS_PYBASE64 = True
+except ImportError:
+    HAS_PYBASE64 = False
+
+# Eventos de formato constante, montados uma única vez para envio com
+# `connection.send` (o SDK os copia ao serializar; não devem ser modificados)
+AUDIO_COMMIT_EVENT = {"type": "input_audio_buffer.commit"}
+RESPONSE_CREATE_EVENT = {"type": "response.create"}
+RESPONSE_CANCEL_EVENT = {"type": "response.cancel"}
+
+# Tamanho padrão, em bytes de áudio, de cada evento input_audio_buffer.append.
+# Trechos grandes reduzem o número de frames enviados pelo WebSocket
+# (64 KiB de áudio viram ~87 mil caracteres base64 por evento).
+APPEND_CHUNK_SIZE = 65536
+
+# Códigos de erro da API que não são críticos para o fluxo de conversa:
+# - resposta ativa já existente ao solicitar uma nova
+# - commit de buffer vazio depois que todo o áudio já foi processado
+# - cancelamento sem resposta ativa
+KNOWN_BENIGN_ERRORS = frozenset({
+    "conversation_already_has_active_response",
+    "input_audio_buffer_commit_empty",
+    "response_cancel_not_active",
+})
+
+# Marcadores usados na leitura direta dos frames de áudio recebidos
+_AUDIO_DELTA_TYPE = "response.audio.delta"
+_AUDIO_DELTA_PREFIX = b'{"type":"response.audio.delta"'
+_DELTA_KEY = b'"delta":"'
+_ITEM_ID_KEY = b'"item_id":"'
+
+
+class AudioDeltaEvent(NamedTuple):
+    """
+    Versão leve do evento response.audio.delta, extraída do frame bruto.
+
+    Expõe os mesmos atributos usados do evento do SDK (`type`, `item_id` e
+    `delta`), de modo que os consumidores tratam os dois da mesma forma.
+    O `delta` é uma `memoryview` com o texto base64, aceita diretamente
+    pelos decodificadores base64.
+    """
+    type: str
+    item_id: Optional[str]
+    delta: memoryview
+
+
+def encode_audio(audio_data: bytes) -> str:
+    """
+    Codifica áudio em base64, usando o pybase64 quando disponível.
+
+    Args:
+        audio_data: Dados de áudio em bytes
+
+    Returns:
+        Texto base64 (ASCII) sem quebra de linha
+    """
+    if HAS_PYBASE64:
+        return pybase64.b64encode_as_string(audio_data)
+    return binascii.b2a_base64(audio_data, newline=False).decode('ascii')
+
+
+def decode_audio(audio_base64: Union[str, bytes, memoryview]) -> bytes:
+    """
+    Decodifica um trecho de áudio em base64, usando o pybase64 quando disponível.
+
+    Args:
+        audio_base64: Texto base64 recebido em um delta de áudio
+
+    Returns:
+        Dados de áudio PCM16 decodificados
+    """
+    if HAS_PYBASE64:
+        # validate=True usa o caminho SIMD; os deltas do servidor são base64 válido
+        return pybase64.b64decode(audio_base64, validate=True)
+    # a2b_base64 direto, sem a normalização de argumentos do base64.b64decode
+    return binascii.a2b_base64(audio_base64)
+
+
+def audio_append_event(audio_base64: str) -> Dict[str, str]:
+    """
+    Monta o evento input_audio_buffer.append, para envio com `connection.send`.
+
+    Args:
+        audio_base64: Trecho de áudio PCM16 já codificado em base64
+
+    Returns:
+        Evento input_audio_buffer.append
+    """
+    return {"type": "input_audio_buffer.append", "audio": audio_base64}
+
+
+def iter_audio_append_events(audio_data: bytes, chunk_size: int = APPEND_CHUNK_SIZE) -> Iterator[Dict[str, str]]:
+    """
+    Gera os eventos input_audio_buffer.append para um áudio completo.
+
+    O áudio é codificado em base64 uma única vez e o texto é fatiado em
+    trechos com número de caracteres múltiplo de 4, de modo que cada trecho
+    continua sendo um base64 válido por si só.
+
+    Args:
+        audio_data: Áudio PCM16 completo a ser enviado
+        chunk_size: Quantidade aproximada de bytes de áudio por evento
+
+    Yields:
+        Eventos input_audio_buffer.append, prontos para `connection.send`
+    """
+    # Cada 3 bytes de áudio viram 4 caracteres base64
+    b64_chunk_size = -(-chunk_size // 3) * 4
+    audio_base64 = encode_audio(audio_data)
+
+    for i in range(0, len(audio_base64), b64_chunk_size):
+        yield audio_append_event(audio_base64[i:i + b64_chunk_size])
+
+
+@lru_cache(maxsize=8)
+def session_update_event(instructions: str,
+                         voice: str = "alloy",
+                         output_audio_format: str = "pcm16",
+                         modalities: Tuple[str, ...] = ("audio", "text")) -> Dict[str, Any]:
+    """
+    Monta o evento session.update, para envio com `connection.send`.
+
+    O resultado é memorizado por combinação de parâmetros, então o mesmo
+    evento é reaproveitado entre as rodadas. O dicionário é compartilhado e
+    não deve ser modificado (o SDK o copia ao serializar).
+
+    Args:
+        instructions: Instruções que definem a personalidade do assistente
+        voice: Voz a ser utilizada na resposta
+        output_audio_format: Formato do áudio de saída ('pcm16', 'g711_ulaw', etc)
+        modalities: Modalidades da resposta ('audio', 'text')
+
+    Returns:
+        Evento session.update
+    """
+    return {
+        "type": "session.update",
+        "session": {
+            "modalities": list(modalities),
+            "instructions": instructions,
+            "voice": voice,
+            "output_audio_format": output_audio_format,
+        },
+    }
+
+
+def _find_string_value(frame: bytes, key: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Localiza o valor de um campo string no JSON bruto.
+
+    Args:
+        frame: Frame JSON recebido do WebSocket
+        key: Chave já no formato `"nome":"`
+
+    Returns:
+        Tupla (início, fim) do valor dentro do frame, ou None se não encontrado
+    """
+    start = frame.find(key)
+    if start < 0:
+        return None
+
+    start += len(key)
+    end = frame.find(b'"', start)
+    if end < 0:
+        return None
+
+    return start, end
+
+
+def parse_audio_delta(frame: bytes) -> Optional[AudioDeltaEvent]:
+    """
+    Extrai um evento response.audio.delta diretamente do frame bruto.
+
+    Só trata frames no formato compacto enviado pelo servidor; qualquer
+    variação (espaços, ordem de campos diferente, sequências de escape)
+    retorna None para que o frame seja interpretado pelo parser do SDK.
+
+    Args:
+        frame: Frame JSON recebido do WebSocket
+
+    Returns:
+        Evento de áudio extraído, ou None se o frame não puder ser lido
+        pelo caminho rápido
+    """
+    if not frame.startswith(_AUDIO_DELTA_PREFIX):
+        return None
+
+    delta_span = _find_string_value(frame, _DELTA_KEY)
+    if delta_span is None:
+        return None
+
+    start, end = delta_span
+
+    # Sequências de escape (ex.: "\/") exigem o parser JSON completo
+    if frame.find(b'\\', start, end) >= 0:
+        return None
+
+    item_id = None
+    item_span = _find_string_value(frame, _ITEM_ID_KEY)
+    if item_span is not None:
+        item_id = frame[item_span[0]:item_span[1]].decode('ascii')
+
+    return AudioDeltaEvent(_AUDIO_DELTA_TYPE, item_id, memoryview(frame)[start:end])
+
+
+def parse_server_event(connection: Any, frame: bytes) -> Any:
+    """
+    Converte um frame recebido em evento, usando o caminho rápido para áudio.
+
+    Args:
+        connection: Conexão Realtime do SDK da OpenAI
+        frame: Frame JSON recebido do WebSocket
+
+    Returns:
+        AudioDeltaEvent para deltas de áudio, ou o evento do SDK para os demais
+    """
+    event = parse_audio_delta(frame)
+    if event is None:
+        event = connection.parse_event(frame)
+    return event
+
+
+async def iter_server_events(connection: Any) -> AsyncIterator[Any]:
+    """
+    Itera sobre os eventos recebidos de uma conexão Realtime.
+
+    Equivale a `async for event in connection`, mas lê os frames brutos com
+    `recv_bytes` para aplicar o caminho rápido dos deltas de áudio.
+
+    Args:
+        connection: Conexão Realtime do SDK da OpenAI
+
+    Yields:
+        Eventos recebidos do servidor
+    """
+    while True:
+        try:
+            frame = await connection.recv_bytes()
+        except ConnectionClosedOK:
+            return
+
+        yield parse_server_event(connection, frame)
+
+
+async def drain_server_events(connection: Any,
+                              handlers: Mapping[str, Callable[[Any, Any], bool]],
+                              state: Any) -> int:
+    """
+    Despacha os eventos recebidos para tratadores por tipo de evento.
+    
+    Cada tratador recebe o evento e o estado compartilhado e retorna True para
+    encerrar o recebimento. Eventos sem tratador são ignorados.
+    
+    Args:
+        connection: Conexão Realtime do SDK da OpenAI
+        handlers: Tratadores indexados pelo tipo do evento
+        state: Estado repassado a cada tratador
+    
+    Returns:
+        Número de eventos recebidos
+    """
+    event_count = 0
+    
+    async for event in iter_server_events(connection):
+        event_count += 1
+        
+        handler = handlers.get(event.type)
+        if handler is not None and handler(event, state):
+            break
+    
+    return event_count
@@ -9,18 +9,120 @@ chunks de áudio à medida que são recebidos da API, sem precisar esperar
 por todo o conteúdo para iniciar a reprodução.
 """
 
+import gc
 import logging
 import threading
-import queue
 import time
-import numpy as np
 import sounddevice as sd
-from typing import Optional, List, Deque
+from typing import Callable, Deque, Optional, Union
 from collections import deque
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Capacidade do buffer circular de reprodução, em segundos de áudio
+RING_BUFFER_SECONDS = 5.0
+
+
+class _ByteRing:
+    """
+    Buffer circular de bytes pré-alocado, com um produtor e um consumidor.
+    
+    O thread de buffer escreve e o callback do PortAudio lê, sem locks: cada
+    lado só avança o seu próprio contador. Os contadores são crescentes (não
+    dão a volta), então cheio e vazio nunca se confundem.
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Inicializa o buffer circular.
+        
+        Args:
+            capacity: Capacidade do buffer em bytes
+        """
+        self.capacity = capacity
+        self._data = bytearray(capacity)
+        self._view = memoryview(self._data)
+        self._write_pos = 0
+        self._read_pos = 0
+    
+    def __len__(self) -> int:
+        """Número de bytes disponíveis para leitura."""
+        return self._write_pos - self._read_pos
+    
+    def free(self) -> int:
+        """Número de bytes que ainda cabem no buffer."""
+        return self.capacity - (self._write_pos - self._read_pos)
+    
+    def write(self, data) -> int:
+        """
+        Copia o máximo possível de `data` para o buffer (lado do produtor).
+        
+        Args:
+            data: Bytes a escrever (qualquer objeto com protocolo de buffer)
+        
+        Returns:
+            Número de bytes escritos
+        """
+        n = min(len(data), self.free())
+        if n == 0:
+            return 0
+        
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        src = memoryview(data)
+        self._view[start:start + first] = src[:first]
+        if n > first:
+            self._view[:n - first] = src[first:n]
+        
+        self._write_pos += n
+        return n
+    
+    def read_into(self, out, nbytes: int) -> int:
+        """
+        Copia até `nbytes` do buffer para `out` (lado do consumidor).
+        
+        Args:
+            out: Buffer de destino gravável
+            nbytes: Número máximo de bytes a copiar
+        
+        Returns:
+            Número de bytes copiados
+        """
+        n = min(nbytes, self._write_pos - self._read_pos)
+        if n == 0:
+            return 0
+        
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._view[start:start + first]
+        if n > first:
+            out[first:n] = self._view[:n - first]
+        
+        self._read_pos += n
+        return n
+    
+    @property
+    def write_position(self) -> int:
+        """Posição de escrita atual (total de bytes já escritos)."""
+        return self._write_pos
+    
+    def skip_to(self, position: int) -> None:
+        """
+        Descarta os dados até `position` (lado do consumidor).
+        
+        Args:
+            position: Posição obtida de `write_position`
+        """
+        if position > self._read_pos:
+            self._read_pos = position
+    
+    def clear(self) -> None:
+        """
+        Descarta os dados pendentes. Só deve ser chamado com o stream parado.
+        """
+        self._read_pos = self._write_pos
+
 
 class AudioPlayerRealtime:
     """
@@ -28,28 +130,71 @@ class AudioPlayerRealtime:
     contínuo de chunks de áudio.
     """
 
-    def __init__(self, sample_rate: int = 24000, channels: int = 1):
+    def __init__(self, sample_rate: int = 24000, channels: int = 1,
+                 device: Optional[Union[int, str]] = None,
+                 latency: Union[str, float] = "low"):
         """
         Inicializa o reprodutor de áudio em tempo real.
         
         Args:
             sample_rate: Taxa de amostragem do áudio (padrão: 24kHz para API da OpenAI)
             channels: Número de canais de áudio (mono = 1, estéreo = 2)
+            device: Dispositivo de saída do PortAudio (None para o padrão). No Linux,
+                    um dispositivo ALSA direto (ex.: "hw:0,0") evita a reamostragem
+                    do PulseAudio
+            latency: Latência sugerida ao PortAudio ("low", "high" ou segundos);
+                     "low" usa o menor buffer aceito pelo driver
         """
         self.sample_rate = sample_rate
         self.channels = channels
-        self.audio_queue = queue.Queue()
-        self.audio_buffer = bytearray()  # Buffer contínuo para armazenar áudio
+        self.device = device
+        self.latency = latency
+        # Chunks recebidos, ainda fora do buffer circular. append/popleft do
+        # deque não usam mutex, então o callback pode consultá-lo sem bloquear
+        self.audio_queue: Deque[bytes] = deque()
+        self.chunk_available = threading.Event()
+        # Buffer circular pré-alocado entre o thread de buffer e o callback
+        self.audio_buffer = _ByteRing(int(sample_rate * RING_BUFFER_SECONDS) * channels * 2)
         self.stop_flag = threading.Event()
         self.player_thread = None
         self.is_playing = False
         self.buffer_size = 8192  # Aumentar o tamanho do buffer para evitar cortes
         self.buffer_threshold = 0.1  # Segundos de áudio antes de iniciar (100ms)
         self.frame_count = 0
-        self.stream = None  # Stream de áudio para reprodução contínua
+        self.stream = None  # Stream de áudio, mantido aberto entre reproduções
         self.stream_lock = threading.Lock()
         self.buffer_ready = threading.Event()
+        # Lido pelo callback: até o buffer inicial estar pronto, o stream (que
+        # fica sempre ativo) toca silêncio sem consumir o buffer circular
+        self._primed = False
         self.min_buffer_samples = int(sample_rate * 0.2)  # 200ms de buffer mínimo
+        self.blocksize = 1024  # Blocos menores para resposta mais rápida
+        # Bloco de silêncio pré-alocado para underruns, sem alocar no callback
+        self._silence = bytes(self.blocksize * channels * 2)
+        # Fim da resposta: sinalizado pelo callback do stream quando todo o
+        # áudio recebido após mark_input_complete tiver sido tocado
+        self.input_complete = False
+        self.playback_finished = threading.Event()
+        self.on_playback_complete: Optional[Callable[[], None]] = None
+        # Nível de debug lido a cada reprodução, fora do callback de áudio
+        self._debug = False
+        # Posição até a qual o callback deve descartar o buffer (pedido por
+        # stop_playback, já que só o callback move a posição de leitura)
+        self._discard_until: Optional[int] = None
+        # Indica se o GC cíclico foi desligado por esta reprodução
+        self._gc_disabled = False
+        # Geração da reprodução atual: cada start_playback a incrementa, e os
+        # threads de uma reprodução anterior que ainda não terminaram a usam
+        # para não interferir na nova (limpeza e escrita no buffer circular)
+        self._generation = 0
+        
+        # Abrir e iniciar o stream já na criação: ele fica tocando silêncio entre
+        # as respostas, sem configurar o dispositivo no caminho da resposta
+        try:
+            self._open_stream()
+        except sd.PortAudioError as e:
+            # Nova tentativa na primeira reprodução
+            logger.warning(f"Não foi possível abrir o stream de áudio: {e}")
 
     def add_audio_chunk(self, audio_bytes: bytes) -> None:
         """
@@ -61,43 +206,86 @@ class AudioPlayerRealtime:
         if not audio_bytes:
             return
         
-        # Adicionar o chunk à fila
-        self.audio_queue.put(audio_bytes)
+        # Adicionar o chunk à fila e acordar o thread de buffer
+        self.audio_queue.append(audio_bytes)
+        self.chunk_available.set()
         
         # Iniciar o thread de reprodução se ainda não estiver rodando
         if not self.is_playing:
             self.start_playback()
 
-    def _process_audio_buffer(self) -> None:
+    def mark_input_complete(self) -> None:
+        """
+        Sinaliza que não chegarão mais chunks para a resposta atual.
+        
+        Libera o início da reprodução mesmo que o buffer mínimo não tenha sido
+        atingido, para que respostas curtas não esperem o timeout do buffer inicial.
+        """
+        self.input_complete = True
+        self._set_buffer_ready()
+
+    def set_playback_complete_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """
+        Define a função chamada quando todo o áudio da resposta for tocado.
+        
+        A função é chamada no thread de áudio do PortAudio e deve apenas
+        sinalizar outro thread (por exemplo, com `loop.call_soon_threadsafe`).
+        Se a reprodução já tiver terminado, ela é chamada imediatamente.
+        
+        Args:
+            callback: Função sem argumentos, ou None para remover
+        """
+        self.on_playback_complete = callback
+        if callback is not None and self.playback_finished.is_set():
+            callback()
+
+    def _set_buffer_ready(self) -> None:
+        """
+        Libera o início da reprodução: o callback passa a consumir o buffer circular.
+        """
+        self._primed = True
+        self.buffer_ready.set()
+
+    def _process_audio_buffer(self, generation: int) -> None:
         """
         Processa a fila de áudio e mantém um buffer contínuo.
+        
+        Args:
+            generation: Geração da reprodução que iniciou este thread
         """
         try:
-            while not self.stop_flag.is_set():
-                try:
-                    # Obter próximo chunk (com timeout para verificar stop_flag regularmente)
-                    audio_bytes = self.audio_queue.get(timeout=0.2)
-                    
-                    # Adicionar ao buffer contínuo
-                    with self.stream_lock:
-                        self.audio_buffer.extend(audio_bytes)
-                    
-                    # Sinalizar que o buffer está pronto se tiver dados suficientes
-                    if len(self.audio_buffer) >= self.min_buffer_samples * 2:  # * 2 para contar bytes (16-bit = 2 bytes)
-                        self.buffer_ready.set()
-                    
-                    # Marcar como concluído
-                    self.audio_queue.task_done()
-                    
-                    # Incrementar contador de frames
-                    self.frame_count += 1
-                    
-                except queue.Empty:
-                    # Fila vazia, verificar se devemos parar
-                    if self.audio_queue.empty() and self.stop_flag.is_set():
-                        break
-                    # Caso contrário, continuar verificando a fila
+            while not self.stop_flag.is_set() and generation == self._generation:
+                if not self.audio_queue:
+                    # Fila vazia: aguardar o próximo chunk (com timeout para
+                    # verificar stop_flag regularmente)
+                    self.chunk_available.wait(timeout=0.2)
+                    self.chunk_available.clear()
                     continue
+                
+                # Copiar de uma vez todos os chunks já enfileirados, com uma única
+                # aquisição do lock por rajada em vez de uma por chunk
+                with self.stream_lock:
+                    while self.audio_queue and not self.stop_flag.is_set():
+                        # O chunk só sai da fila depois de copiado para o buffer, para
+                        # que fila e buffer nunca pareçam vazios com áudio em trânsito
+                        pending = memoryview(self.audio_queue[0])
+                        
+                        # Aguardar espaço se o buffer circular estiver cheio
+                        # (a API envia áudio mais rápido que o tempo real)
+                        while pending:
+                            written = self.audio_buffer.write(pending)
+                            pending = pending[written:]
+                            if not pending or self.stop_flag.is_set():
+                                break
+                            # Cheio: deixar o buffer pronto para tocar e esperar
+                            self._set_buffer_ready()
+                            time.sleep(0.01)
+                        
+                        self.audio_queue.popleft()
+                        
+                        # Sinalizar que o buffer está pronto se tiver dados suficientes
+                        if len(self.audio_buffer) >= self.min_buffer_samples * 2:  # * 2 para contar bytes (16-bit = 2 bytes)
+                            self._set_buffer_ready()
         except Exception as e:
             logger.error(f"Erro no processamento do buffer de áudio: {e}")
 
@@ -107,91 +295,165 @@ class AudioPlayerRealtime:
         
         Este método é crítico para a reprodução contínua sem cortes.
         """
-        if status:
-            logger.debug(f"Status do stream: {status}")
+        # Nada de formatação de strings no thread de áudio sem o nível de debug
+        debug = self._debug
+        if status and debug:
+            logger.debug("Status do stream: %s", status)
             
-        # Adquirir o lock para acessar o buffer de áudio
-        with self.stream_lock:
-            # Número de bytes a ler (frames * channels * 2 bytes por amostra)
-            bytes_to_read = frames * self.channels * 2
+        # Descartar o áudio de uma reprodução interrompida por stop_playback
+        discard_until = self._discard_until
+        if discard_until is not None:
+            self._discard_until = None
+            self.audio_buffer.skip_to(discard_until)
             
-            if len(self.audio_buffer) >= bytes_to_read:
-                # Temos dados suficientes no buffer
-                data = self.audio_buffer[:bytes_to_read]
-                self.audio_buffer = self.audio_buffer[bytes_to_read:]
-                
-                # Converter para numpy array
-                audio_np = np.frombuffer(data, dtype=np.int16)
-                
-                # Copiar para a saída
-                outdata[:] = audio_np.reshape(-1, self.channels)
+        # Número de bytes a ler (frames * channels * 2 bytes por amostra)
+        bytes_to_read = frames * self.channels * 2
+        
+        # Buffer inicial ainda não atingido: tocar silêncio sem consumir o
+        # buffer, para que a resposta não comece com fragmentos intercalados
+        if not self._primed:
+            silence = self._silence
+            if len(silence) != bytes_to_read:
+                silence = self._silence = bytes(bytes_to_read)
+            outdata[:] = silence
+            return
+        
+        # O callback só avança a posição de leitura do buffer circular, então
+        # não precisa do lock compartilhado com o thread de buffer
+        if len(self.audio_buffer) >= bytes_to_read:
+            # Temos dados suficientes no buffer: copiar os bytes PCM direto
+            # do buffer circular para o buffer do PortAudio
+            self.audio_buffer.read_into(outdata, bytes_to_read)
+            
+            # Contar os frames efetivamente tocados, e não os chunks enfileirados
+            self.frame_count += frames
+        else:
+            # Buffer underrun - tocar o que houver (em frames inteiros) e
+            # completar com silêncio (bloco pré-alocado; só é recriado se o
+            # PortAudio pedir um bloco de outro tamanho)
+            silence = self._silence
+            if len(silence) != bytes_to_read:
+                silence = self._silence = bytes(bytes_to_read)
+            
+            frame_bytes = self.channels * 2
+            available = len(self.audio_buffer)
+            available -= available % frame_bytes
+            if available:
+                self.audio_buffer.read_into(outdata, available)
+                self.frame_count += available // frame_bytes
+                with memoryview(silence) as silence_view:
+                    outdata[available:bytes_to_read] = silence_view[available:]
             else:
-                # Buffer underrun - preencher com silêncio
-                outdata.fill(0)
-                
-                # Se não temos mais dados e a fila está vazia, sinalizar o fim da reprodução
-                if self.audio_queue.empty() and (len(self.audio_buffer) < bytes_to_read):
-                    # Se não há mais dados chegando e pedimos para parar
-                    if self.stop_flag.is_set():
-                        # Usar exceção especial para interromper o stream
-                        raise sd.CallbackStop
-                
-                logger.debug(f"Buffer underrun: {len(self.audio_buffer)} bytes disponíveis, {bytes_to_read} bytes necessários")
+                outdata[:] = silence
+            
+            # Se não temos mais dados e a fila está vazia, sinalizar o fim da reprodução
+            # (o stream continua ativo, tocando silêncio até a próxima resposta)
+            if not self.audio_queue and (len(self.audio_buffer) < bytes_to_read):
+                # Todo o áudio da resposta foi tocado: avisar uma única vez
+                if self.input_complete and not self.playback_finished.is_set():
+                    self.playback_finished.set()
+                    callback = self.on_playback_complete
+                    if callback is not None:
+                        callback()
+            
+            if debug:
+                logger.debug("Buffer underrun: %d bytes disponíveis, %d bytes necessários",
+                             len(self.audio_buffer), bytes_to_read)
 
-    def _player_worker(self) -> None:
+    def _player_worker(self, generation: int) -> None:
         """
         Worker thread que gerencia a reprodução contínua de áudio.
+        
+        Args:
+            generation: Geração da reprodução que iniciou este thread
         """
         try:
             logger.debug("Thread de reprodução iniciada")
             
             # Iniciar a thread de processamento do buffer
-            buffer_thread = threading.Thread(target=self._process_audio_buffer)
+            buffer_thread = threading.Thread(target=self._process_audio_buffer, args=(generation,))
             buffer_thread.daemon = True
             buffer_thread.start()
             
-            # Aguardar um pouco para acumular o buffer inicial
-            buffer_start_time = time.time()
+            # Aguardar até ter buffer inicial suficiente ou timeout, numa única
+            # espera (stop_playback também sinaliza buffer_ready para acordar aqui)
             buffer_timeout = 2.0  # 2 segundos no máximo para aguardar buffer
+            self.buffer_ready.wait(timeout=buffer_timeout)
+            if self.stop_flag.is_set() or generation != self._generation:
+                return
             
-            # Aguardar até ter buffer suficiente ou timeout
-            while not self.buffer_ready.is_set() and time.time() - buffer_start_time < buffer_timeout:
-                if self.stop_flag.is_set():
-                    return
-                time.sleep(0.05)
-            
-            # Iniciar o stream de áudio
-            self.stream = sd.OutputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                dtype='int16',
-                callback=self._stream_callback,
-                blocksize=1024  # Blocos menores para resposta mais rápida
-            )
+            # Após o timeout, tocar o que houver mesmo abaixo do buffer mínimo
+            self._primed = True
             
-            # Iniciar a reprodução contínua
-            self.stream.start()
+            # O stream já foi aberto e iniciado no construtor; aqui ele só é
+            # reaberto se isso falhou, ou reiniciado se foi interrompido
+            # (um stream interrompido precisa ser parado antes de reiniciar)
+            if self.stream is None:
+                self._open_stream()
+            elif not self.stream.active:
+                self._pause_stream()
+                self.stream.start()
             
             # Aguardar até que seja sinalizado para parar
-            while not self.stop_flag.is_set() or not self.audio_queue.empty() or len(self.audio_buffer) > 0:
+            while ((not self.stop_flag.is_set() or self.audio_queue or len(self.audio_buffer) > 0)
+                   and generation == self._generation):
                 time.sleep(0.1)
                 
-            # Garantir que o stream seja fechado adequadamente
-            if self.stream and self.stream.active:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
-                
             logger.debug("Thread de reprodução encerrada")
         except Exception as e:
             logger.error(f"Erro fatal na thread de reprodução: {e}")
         finally:
-            self.is_playing = False
-            # Fechar o stream se ainda estiver aberto
-            if self.stream and self.stream.active:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
+            # Uma nova reprodução já pode ter começado (stop_playback não espera
+            # este thread terminar): nesse caso o estado pertence a ela
+            if generation == self._generation:
+                self.is_playing = False
+                self._restore_gc()
+
+    def _restore_gc(self) -> None:
+        """
+        Religa o GC cíclico, se ele tiver sido desligado por `start_playback`.
+        
+        Não força uma coleta completa (que seguraria o GIL por todo o heap no
+        fim de cada resposta); o lixo acumulado é recolhido pelos limiares
+        normais de cada geração.
+        """
+        if not self._gc_disabled:
+            return
+            
+        self._gc_disabled = False
+        gc.enable()
+
+    def _open_stream(self) -> None:
+        """
+        Abre e inicia o stream de saída, que fica ativo até `close()`.
+        
+        Raises:
+            sd.PortAudioError: Se o dispositivo de saída não puder ser aberto
+        """
+        self.stream = sd.RawOutputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype='int16',
+            callback=self._stream_callback,
+            blocksize=self.blocksize,
+            device=self.device,
+            latency=self.latency
+        )
+        self.stream.start()
+
+    def _pause_stream(self) -> None:
+        """
+        Para o stream de áudio sem fechá-lo, para que possa ser reiniciado.
+        """
+        stream = self.stream
+        if stream is None or stream.stopped:
+            return
+            
+        try:
+            stream.stop()
+        except sd.PortAudioError as e:
+            # Pode ocorrer se o stream foi parado por outra thread ao mesmo tempo
+            logger.debug(f"Erro ao parar o stream: {e}")
 
     def start_playback(self) -> None:
         """
@@ -200,13 +462,26 @@ class AudioPlayerRealtime:
         if self.is_playing:
             return
             
+        # Atualizar o nível de debug usado pelo callback de áudio
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        
         # Resetar a flag de parada
         self.stop_flag.clear()
+        self._primed = False
         self.buffer_ready.clear()
+        self.input_complete = False
+        self.playback_finished.clear()
         self.is_playing = True
         
-        # Iniciar thread de reprodução
-        self.player_thread = threading.Thread(target=self._player_worker)
+        # Desligar o GC cíclico durante a reprodução, para que uma coleta não
+        # pause o callback de áudio (religado em stop_playback)
+        if gc.isenabled():
+            gc.disable()
+            self._gc_disabled = True
+        
+        # Iniciar thread de reprodução, numa nova geração
+        self._generation += 1
+        self.player_thread = threading.Thread(target=self._player_worker, args=(self._generation,))
         self.player_thread.daemon = True  # Thread em background
         self.player_thread.start()
 
@@ -214,36 +489,49 @@ class AudioPlayerRealtime:
         """
         Para a reprodução de áudio e limpa a fila.
         """
+        # Religar o GC mesmo que a thread de reprodução já tenha terminado
+        self._restore_gc()
+        
         if not self.is_playing:
             return
             
-        # Sinalizar para a thread parar
+        # Sinalizar para a thread parar (e acordá-la se ainda aguarda o buffer
+        # inicial); o callback volta a tocar silêncio até a próxima resposta
         self.stop_flag.set()
+        self._primed = False
+        self.buffer_ready.set()
         
         # Aguardar a thread terminar (com timeout)
         if self.player_thread and self.player_thread.is_alive():
             self.player_thread.join(timeout=0.1)
         
-        # Fechar o stream se necessário
-        if self.stream and self.stream.active:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-            
-        # Limpar a fila
+        # Limpar a fila (o stream continua ativo para a próxima reprodução)
         with self.stream_lock:
-            while not self.audio_queue.empty():
-                try:
-                    self.audio_queue.get_nowait()
-                    self.audio_queue.task_done()
-                except queue.Empty:
-                    break
+            self.audio_queue.clear()
             
-            # Limpar o buffer
-            self.audio_buffer.clear()
+            # Limpar o buffer: com o stream ativo, o próprio callback descarta
+            # o que foi escrito até aqui, pois só ele move a posição de leitura
+            if self.stream is not None and self.stream.active:
+                self._discard_until = self.audio_buffer.write_position
+            else:
+                self.audio_buffer.clear()
         
+        self.frame_count = 0
         self.is_playing = False
 
+    def close(self) -> None:
+        """
+        Para a reprodução e fecha o stream de áudio.
+        """
+        self.stop_playback()
+        
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except sd.PortAudioError as e:
+                logger.debug(f"Erro ao fechar o stream: {e}")
+            self.stream = None
+
     def reset_frame_count(self) -> None:
         """
         Reseta o contador de frames (útil para novas sessões).
@@ -261,7 +549,7 @@ class AudioPlayerRealtime:
         # ou não tivermos mais do que uma pequena quantidade de dados, consideramos que terminou
         buffer_threshold = 100  # Consideramos vazio se tiver menos que 100 bytes 
         
-        if self.audio_queue.empty() and len(self.audio_buffer) < buffer_threshold:
+        if not self.audio_queue and len(self.audio_buffer) < buffer_threshold:
             if self.stream is None or not self.stream.active:
                 return True
             
@@ -289,9 +577,9 @@ class AudioPlayerRealtime:
         buffer_almost_empty = len(self.audio_buffer) < (self.sample_rate * 0.1)  # Menos de 100ms de áudio
         stream_inactive = self.stream is None or not self.stream.active
         
-        return (self.audio_queue.empty() and 
+        return (not self.audio_queue and 
                 (buffer_almost_empty or stream_inactive) and
-                (self.frame_count > 0))  # Garantir que pelo menos um frame foi processado
+                (self.frame_count > 0))  # Garantir que pelo menos um frame foi tocado
 
     def get_buffer_size(self) -> int:
         """
@@ -300,10 +588,10 @@ class AudioPlayerRealtime:
         Returns:
             Número de chunks no buffer
         """
-        return self.audio_queue.qsize()
+        return len(self.audio_queue)
 
     def __del__(self) -> None:
         """
         Destrutor que garante que a reprodução seja interrompida.
         """
-        self.stop_playback()
+        self.close()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Instância compartilhada do PyAudio.
+
+Inicializar e finalizar o PortAudio enumera os dispositivos de áudio a cada
+vez, o que é caro para ser repetido a cada gravação. Este módulo mantém uma
+única instância do PyAudio para todo o processo; cada gravação abre e fecha
+apenas o seu próprio stream, e o PortAudio é finalizado na saída do programa.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Optional
+
+import pyaudio
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+_pyaudio: Optional[pyaudio.PyAudio] = None
+_pyaudio_lock = threading.Lock()
+
+
+def get_pyaudio() -> pyaudio.PyAudio:
+    """
+    Obtém a instância compartilhada do PyAudio, criando-a na primeira chamada.
+
+    Pode ser chamada de qualquer thread. A instância não deve ser finalizada
+    com `terminate()` por quem a utiliza.
+
+    Returns:
+        Instância do PyAudio
+    """
+    global _pyaudio
+
+    with _pyaudio_lock:
+        if _pyaudio is None:
+            _pyaudio = pyaudio.PyAudio()
+            atexit.register(_terminate_pyaudio)
+            logger.debug("PyAudio inicializado")
+
+        return _pyaudio
+
+
+def _terminate_pyaudio() -> None:
+    """
+    Finaliza a instância compartilhada do PyAudio, se existir.
+    """
+    global _pyaudio
+
+    with _pyaudio_lock:
+        if _pyaudio is not None:
+            _pyaudio.terminate()
+            _pyaudio = None
@@ -6,17 +6,73 @@ usando sounddevice e outras bibliotecas de áudio modernas e compatíveis.
 """
 
 import asyncio
-import io
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
+# Importação condicional para numpy-rms (RMS em C com SIMD)
+try:
+    import numpy_rms
+    HAS_NUMPY_RMS = True
+except ImportError:
+    HAS_NUMPY_RMS = False
+
+# Importação condicional para numba (compilação JIT do cálculo de energia)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Mapeamento de formatos de áudio da configuração para dtypes do numpy
+_FORMAT_MAP = {
+    "Int8": np.int8,
+    "Int16": np.int16,
+    "Int32": np.int32,
+    "Float32": np.float32
+}
+
+# Fator que leva o limiar de silêncio, expresso na escala do Int16, para a
+# escala de amplitude de cada formato
+_THRESHOLD_SCALE = {
+    "Int8": 1.0 / 256,
+    "Int16": 1.0,
+    "Int32": 65536.0,
+    "Float32": 1.0 / 32768
+}
+
+# Número de chunks avaliados juntos na detecção de silêncio
+_SILENCE_WINDOW_CHUNKS = 4
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _energy_above(samples, threshold_sq):
+        """
+        Verifica se a média dos quadrados das amostras passa do limiar ao quadrado.
+        
+        Uma única passada, sem arrays temporários nem raiz quadrada. O numba
+        compila uma versão para cada dtype de entrada (int16, float32, ...).
+        
+        Args:
+            samples: Amostras de áudio (array 1-D)
+            threshold_sq: Limiar de silêncio ao quadrado
+        
+        Returns:
+            True se a energia média for maior que o limiar
+        """
+        total = 0.0
+        for i in range(samples.size):
+            value = float(samples[i])
+            total += value * value
+        return total > threshold_sq * samples.size
+
 
 class AudioRecorder:
     """
@@ -41,20 +97,29 @@ class AudioRecorder:
         self.channels = config.get("channels", 1)
         self.chunk_size = config.get("chunk_size", 1024)
         
-        # Mapeamento de formatos de áudio para numpy
-        format_map = {
-            "Int8": np.int8,
-            "Int16": np.int16,
-            "Int32": np.int32,
-            "Float32": np.float32
-        }
+        # Formato de áudio para numpy
         format_str = config.get("format", "Int16")
-        self.dtype = format_map.get(format_str, np.int16)
+        self.dtype = _FORMAT_MAP.get(format_str, np.int16)
         
         # Configuração para detecção de silêncio
         self.silence_threshold = config.get("silence_threshold", 700)  # Valor padrão para formato Int16
+        # O limiar é sempre dado na escala do Int16; em vez de converter cada
+        # chunk para int16, a escala do formato é aplicada uma vez ao limiar
+        self._threshold = float(self.silence_threshold) * _THRESHOLD_SCALE.get(format_str, 1.0)
+        self._threshold_sq = self._threshold ** 2
         self.silence_duration = config.get("silence_duration", 1.0)  # Segundos
         
+        # Escolher uma única vez o kernel de energia para o formato configurado,
+        # sem testar bibliotecas e dtype a cada chunk no callback de áudio
+        if HAS_NUMBA:
+            self._is_above_threshold = self._is_above_threshold_numba
+            # Compilar já a versão do dtype configurado, fora do thread de áudio
+            _energy_above(np.zeros(1, dtype=self.dtype), self._threshold_sq)
+        elif HAS_NUMPY_RMS and self.dtype is np.float32:
+            self._is_above_threshold = self._is_above_threshold_rms
+        else:
+            self._is_above_threshold = self._is_above_threshold_einsum
+        
         # Verificar dispositivos disponíveis
         try:
             self.devices = sd.query_devices()
@@ -73,7 +138,27 @@ class AudioRecorder:
             duration: Duração máxima da gravação em segundos (None para usar detecção de silêncio)
         
         Returns:
-            Dados de áudio gravados como bytes
+            Áudio PCM bruto gravado (amostras intercaladas no formato da configuração)
+        
+        Raises:
+            RuntimeError: Se ocorrer erro durante a gravação
+        """
+        audio = await self.record_array(duration)
+        return audio.tobytes()
+    
+    async def record_array(self, duration: Optional[float] = None) -> np.ndarray:
+        """
+        Grava áudio do microfone e retorna as amostras sem convertê-las para bytes.
+        
+        O array é uma view do buffer da gravação, sem cópia. O nível de áudio é
+        avaliado em janelas de _SILENCE_WINDOW_CHUNKS chunks, então o início da
+        fala e o silêncio são detectados com essa granularidade.
+        
+        Args:
+            duration: Duração máxima da gravação em segundos (None para usar detecção de silêncio)
+        
+        Returns:
+            Array (amostras, canais) no dtype da configuração; vazio se não houve fala
         
         Raises:
             RuntimeError: Se ocorrer erro durante a gravação
@@ -85,31 +170,83 @@ class AudioRecorder:
             # Coletar dados de áudio
             max_duration = duration or 60  # Limite de 60s se duração não especificada
             
-            # Lista para armazenar os frames de áudio
-            audio_frames = []
+            warmup = 0.5  # Ruído inicial descartado (segundos)
+            timeout = 10  # 10 segundos de espera pela fala
+            
+            # Limites convertidos para número de chunks, contados pelo callback
+            chunks_per_second = self.sample_rate / self.chunk_size
+            warmup_chunks = int(warmup * chunks_per_second)
+            timeout_chunks = int(np.ceil(timeout * chunks_per_second))
+            max_recording_chunks = int(np.ceil(max_duration * chunks_per_second))
+            silence_limit = int(self.silence_duration * chunks_per_second)
+            
+            # Buffer pré-alocado com um bloco por chunk, cobrindo o aquecimento,
+            # a espera pela fala e a duração máxima
+            max_chunks = warmup_chunks + timeout_chunks + max_recording_chunks + 1
+            frames_buf = np.empty((max_chunks, self.chunk_size, self.channels), dtype=self.dtype)
+            # Visão em bytes do mesmo buffer, para copiar o bloco bruto do PortAudio
+            buf_bytes = memoryview(frames_buf.reshape(-1).view(np.uint8))
+            chunk_bytes = frames_buf[0].nbytes
+            write_idx = 0
             silence_frames = 0
-            silence_limit = int(self.silence_duration * self.sample_rate / self.chunk_size)
+            speech_start = None  # Índice do chunk em que a fala começou
+            end_reason = None
+            
+            # O callback decide quando a gravação termina e avisa o event loop
+            loop = asyncio.get_running_loop()
+            done = asyncio.Event()
+            
+            def finish(reason: str) -> None:
+                nonlocal end_reason
+                end_reason = reason
+                loop.call_soon_threadsafe(done.set)
+                raise sd.CallbackStop()
             
             # Callback para processamento do áudio
             def callback(indata, frames, time, status):
-                nonlocal silence_frames
+                nonlocal silence_frames, write_idx, speech_start
                 
                 if status:
-                    logger.warning(f"Status de áudio: {status}")
+                    logger.warning("Status de áudio: %s", status)
+                
+                # Copiar o bloco bruto direto para o buffer (indata é reutilizado pelo
+                # PortAudio), sem criar um ndarray por callback
+                offset = write_idx * chunk_bytes
+                buf_bytes[offset:offset + chunk_bytes] = indata
+                write_idx += 1
                 
-                # Converter para o formato adequado
-                audio_chunk = indata.copy()
+                # Ignorar o ruído inicial do microfone, sem calcular o nível
+                if write_idx <= warmup_chunks:
+                    return
                 
-                # Verificar nível de áudio
-                if not self._is_above_threshold(audio_chunk):
-                    silence_frames += 1
-                else:
-                    silence_frames = 0
+                # Verificar o nível de áudio a cada janela de chunks: as linhas já
+                # estão contíguas no buffer, então a janela é uma view sem cópia
+                is_above = False
+                if (write_idx - warmup_chunks) % _SILENCE_WINDOW_CHUNKS == 0:
+                    is_above = self._is_above_threshold(
+                        frames_buf[write_idx - _SILENCE_WINDOW_CHUNKS:write_idx]
+                    )
+                    if not is_above:
+                        silence_frames += _SILENCE_WINDOW_CHUNKS
+                    else:
+                        silence_frames = 0
+                
+                # Esperar por algum som que não seja silêncio
+                if speech_start is None:
+                    if is_above:
+                        speech_start = write_idx
+                    elif write_idx >= warmup_chunks + timeout_chunks:
+                        finish("no_speech")
+                    return
                 
-                audio_frames.append(audio_chunk)
+                # Continuar gravando até detectar silêncio prolongado ou atingir duração máxima
+                if write_idx - speech_start >= max_recording_chunks or write_idx >= max_chunks:
+                    finish("max_duration")
+                elif silence_frames >= silence_limit:
+                    finish("silence")
             
             # Configurar o stream com callback
-            stream = sd.InputStream(
+            stream = sd.RawInputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype=self.dtype,
@@ -117,67 +254,62 @@ class AudioRecorder:
                 callback=callback
             )
             
-            # Iniciar gravação
+            # Iniciar gravação e aguardar o sinal do callback, sem polling
             with stream:
-                # Remover ruído inicial (500ms)
-                await asyncio.sleep(0.5)
-                
-                # Esperar por algum som que não seja silêncio
-                is_speaking = False
-                timeout = 10  # 10 segundos de espera
-                start_time = asyncio.get_event_loop().time()
-                
-                while not is_speaking and (asyncio.get_event_loop().time() - start_time) < timeout:
-                    if len(audio_frames) > 0 and self._is_above_threshold(audio_frames[-1]):
-                        is_speaking = True
-                        break
-                    await asyncio.sleep(0.1)
-                
-                if not is_speaking:
-                    logger.info("Nenhum áudio detectado, encerrando gravação")
-                    return b""
-                
-                # Continuar gravando até detectar silêncio prolongado ou atingir duração máxima
-                recording_start = asyncio.get_event_loop().time()
-                
-                while True:
-                    current_time = asyncio.get_event_loop().time()
-                    elapsed = current_time - recording_start
-                    
-                    # Verificar duração máxima
-                    if elapsed >= max_duration:
-                        logger.info("Atingida duração máxima de gravação")
-                        break
-                    
-                    # Verificar silêncio
-                    if silence_frames >= silence_limit:
-                        logger.info("Silêncio detectado, encerrando gravação")
-                        break
-                    
-                    await asyncio.sleep(0.1)
+                try:
+                    await asyncio.wait_for(done.wait(), timeout=warmup + timeout + max_duration + 1.0)
+                except asyncio.TimeoutError:
+                    # O stream parou de entregar áudio; encerrar com o que foi capturado
+                    logger.warning("Stream de áudio não respondeu, encerrando gravação")
             
-            # Combinar todos os frames em um único buffer de áudio
-            if not audio_frames:
-                return b""
-                
-            combined_audio = np.vstack(audio_frames)
+            if speech_start is None:
+                logger.info("Nenhum áudio detectado, encerrando gravação")
+                return frames_buf[:0].reshape(-1, self.channels)
             
-            # Converter para bytes
-            byte_io = io.BytesIO()
-            sf.write(byte_io, combined_audio, self.sample_rate, format='WAV')
-            byte_io.seek(0)
-            audio_data = byte_io.read()
+            if end_reason == "silence":
+                logger.info("Silêncio detectado, encerrando gravação")
+            elif end_reason == "max_duration":
+                logger.info("Atingida duração máxima de gravação")
             
+            # Os chunks já estão contíguos no buffer: basta uma view dos preenchidos.
+            # O cabeçalho WAV só é gerado em save_to_file
             logger.info("Gravação concluída")
-            return audio_data
+            return frames_buf[:write_idx].reshape(-1, self.channels)
             
         except Exception as e:
             logger.error(f"Erro durante a gravação: {e}")
             raise RuntimeError(f"Falha na gravação de áudio: {e}")
     
-    def _is_above_threshold(self, data: np.ndarray) -> bool:
+    def _is_above_threshold_numba(self, data: np.ndarray) -> bool:
+        """
+        Verifica se o nível de áudio está acima do limiar de silêncio (kernel numba).
+        
+        Args:
+            data: Dados de áudio a serem verificados
+        
+        Returns:
+            True se o áudio estiver acima do limiar de silêncio
+        """
+        # Kernel compilado: compara a soma dos quadrados, sem a raiz
+        return _energy_above(data.reshape(-1), self._threshold_sq)
+    
+    def _is_above_threshold_rms(self, data: np.ndarray) -> bool:
+        """
+        Verifica se o nível de áudio está acima do limiar de silêncio (numpy-rms).
+        
+        Args:
+            data: Dados de áudio em float32 a serem verificados
+        
+        Returns:
+            True se o áudio estiver acima do limiar de silêncio
+        """
+        # Quadrado, soma e raiz numa única passada SIMD (numpy-rms só aceita float32)
+        samples = data.reshape(-1)
+        return numpy_rms.rms(samples, window_size=samples.size)[0] > self._threshold
+    
+    def _is_above_threshold_einsum(self, data: np.ndarray) -> bool:
         """
-        Verifica se o nível de áudio está acima do limiar de silêncio.
+        Verifica se o nível de áudio está acima do limiar de silêncio (numpy puro).
         
         Args:
             data: Dados de áudio a serem verificados
@@ -185,26 +317,32 @@ class AudioRecorder:
         Returns:
             True se o áudio estiver acima do limiar de silêncio
         """
-        # Calcular o valor RMS (root mean square)
-        rms = np.sqrt(np.mean(np.square(data)))
-        return rms > self.silence_threshold
+        # Soma dos quadrados sem o array temporário de np.square, acumulada
+        # em float64 para que amostras inteiras não estourem. A raiz é monotônica,
+        # então basta comparar com o limiar ao quadrado vezes o número de amostras
+        samples = data.reshape(-1)
+        sum_sq = np.einsum('i,i->', samples, samples, dtype=np.float64)
+        return sum_sq > self._threshold_sq * samples.size
     
-    def save_to_file(self, audio_data: bytes, filename: str) -> None:
+    def save_to_file(self, audio_data: Union[bytes, np.ndarray], filename: str) -> None:
         """
         Salva os dados de áudio em um arquivo WAV.
         
         Args:
-            audio_data: Dados de áudio a serem salvos
+            audio_data: Áudio PCM bruto retornado por record() ou array de record_array()
             filename: Nome do arquivo de saída
         
         Raises:
             IOError: Se ocorrer erro ao salvar o arquivo
         """
         try:
-            # Abrir os dados como um arquivo WAV
-            with io.BytesIO(audio_data) as buf:
-                data, sample_rate = sf.read(buf)
-                sf.write(filename, data, sample_rate)
+            # Interpretar o PCM bruto com o formato da gravação (sem cópia)
+            # e codificar o WAV apenas aqui
+            if isinstance(audio_data, np.ndarray):
+                data = audio_data.reshape(-1, self.channels)
+            else:
+                data = np.frombuffer(audio_data, dtype=self.dtype).reshape(-1, self.channels)
+            sf.write(filename, data, self.sample_rate)
             
             logger.debug(f"Áudio salvo em {filename}")
         except Exception as e:
@@ -18,6 +18,8 @@ import threading
 import queue
 from typing import Optional, List, Tuple, Callable
 
+from src.audio.portaudio import get_pyaudio
+
 # Configurar logger
 logger = logging.getLogger(__name__)
 
@@ -78,6 +80,12 @@ class SmartRecorder:
         self.silence_start_time = 0
         self.recording_start_time = 0
         
+        # Estado da gravação em curso, atualizado pelo callback de áudio
+        self._is_speech_detected = False
+        self._chunk_callback = None
+        self._capture_buffer = None
+        self._captured_samples = 0
+        
         # Fila para dados de diagnóstico
         self.debug_queue = queue.Queue()
         
@@ -97,9 +105,8 @@ class SmartRecorder:
             return self.ambient_noise_level
             
         try:
-            # Inicializar PyAudio temporariamente para calibração
-            temp_audio = pyaudio.PyAudio()
-            temp_stream = temp_audio.open(
+            # Abrir um stream temporário para calibração (PyAudio compartilhado)
+            temp_stream = get_pyaudio().open(
                 format=FORMAT,
                 channels=self.channels,
                 rate=self.sample_rate,
@@ -114,12 +121,10 @@ class SmartRecorder:
                 data = temp_stream.read(CHUNK_SIZE, exception_on_overflow=False)
                 audio_data = np.frombuffer(data, dtype=np.int16)
                 ambient_noise.append(self._calculate_rms(audio_data))
-                time.sleep(0.01)
             
-            # Fechar recursos temporários
+            # Fechar o stream temporário
             temp_stream.stop_stream()
             temp_stream.close()
-            temp_audio.terminate()
             
             # Calcular nível médio de ruído ambiente
             self.ambient_noise_level = np.mean(ambient_noise) if ambient_noise else 0
@@ -137,13 +142,17 @@ class SmartRecorder:
             logger.error(f"Erro durante a calibração do microfone: {e}")
             return 0
     
-    def start_recording(self, callback: Optional[Callable[[bytes], None]] = None) -> None:
+    def start_recording(self,
+                        callback: Optional[Callable[[bytes], None]] = None,
+                        chunk_callback: Optional[Callable[[bytes], None]] = None) -> None:
         """
         Inicia a gravação inteligente de áudio em um thread separado.
         
         Args:
             callback: Função chamada quando a gravação for concluída,
                      recebendo os dados de áudio como parâmetro
+            chunk_callback: Função chamada, no thread de gravação, com cada chunk
+                     gravado assim que é capturado (opcional)
         """
         if self.is_recording:
             logger.warning("Gravação já está em andamento.")
@@ -157,7 +166,7 @@ class SmartRecorder:
         # Iniciar thread para gravação
         self.record_thread = threading.Thread(
             target=self._record_audio,
-            args=(callback,)
+            args=(callback, chunk_callback)
         )
         self.record_thread.daemon = True
         self.record_thread.start()
@@ -186,12 +195,8 @@ class SmartRecorder:
             except Exception as e:
                 logger.error(f"Erro ao fechar o stream: {e}")
                 
-        if self.audio:
-            try:
-                self.audio.terminate()
-                self.audio = None
-            except Exception as e:
-                logger.error(f"Erro ao terminar o PyAudio: {e}")
+        # O PyAudio é compartilhado e só é finalizado na saída do programa
+        self.audio = None
                 
         self.is_recording = False
         logger.info("Gravação inteligente interrompida.")
@@ -206,143 +211,94 @@ class SmartRecorder:
         Returns:
             Valor RMS calculado
         """
-        audio_squared = np.square(audio_data.astype(np.float32))
-        mean_squared = np.mean(audio_squared)
+        if audio_data.size == 0:
+            return 0.0
         
-        # Evitar erro de raiz quadrada com números negativos
-        if mean_squared > 0:
-            rms = np.sqrt(mean_squared)
-        else:
-            rms = 0.0
-            
-        return rms
+        # Soma dos quadrados numa única passada, sem o array convertido nem o
+        # temporário de np.square; o acúmulo em float64 evita estouro do int16
+        sum_squared = np.einsum('i,i->', audio_data, audio_data, dtype=np.float64)
+        return float(np.sqrt(sum_squared / audio_data.size))
         
-    def _record_audio(self, callback: Optional[Callable[[bytes], None]] = None) -> None:
+    def _record_audio(self,
+                      callback: Optional[Callable[[bytes], None]] = None,
+                      chunk_callback: Optional[Callable[[bytes], None]] = None) -> None:
         """
-        Thread de gravação que monitora o áudio, detecta fala e silêncio.
+        Thread de gravação: prepara a captura, aguarda o fim e entrega o áudio.
+        
+        O stream é aberto em modo callback: o PortAudio entrega cada chunk em
+        seu próprio thread, onde `_audio_callback` detecta fala e silêncio. Este
+        thread apenas aguarda o fim da gravação, sem um loop de leitura bloqueante.
         
         Args:
             callback: Função chamada quando a gravação for concluída
+            chunk_callback: Função chamada com cada chunk gravado
         """
         try:
-            # Inicializar PyAudio
-            self.audio = pyaudio.PyAudio()
+            # Calibração - usar a calibração existente ou fazer uma nova se necessário
+            # (antes de abrir o stream de gravação, que já começa a entregar chunks)
+            if not self.is_calibrated:
+                self.calibrate_microphone()
+            else:
+                print(f"Usando calibração existente. Ruído ambiente: {self.ambient_noise_level:.1f}")
+            
+            # Variáveis de controle, lidas e atualizadas pelo callback de áudio
+            self._is_speech_detected = False
+            self.recording_start_time = 0
+            self.silence_start_time = 0
+            self._chunk_callback = chunk_callback
+            self._debug_info = {"rms_values": [], "timestamps": [], "states": []}
+            
+            # Dados de diagnóstico só são coletados com o log em nível DEBUG
+            self._collect_debug = logger.isEnabledFor(logging.DEBUG)
+            self._add_state = self._debug_info["states"].append if self._collect_debug else (lambda state: None)
+            
+            # Buffer único pré-alocado para toda a gravação, dimensionado pela
+            # duração máxima (mais um chunk de folga), em vez de uma lista de bytes
+            self._chunk_samples = CHUNK_SIZE * self.channels
+            max_chunks = int(np.ceil(self.max_speech_duration * self.sample_rate / CHUNK_SIZE)) + 1
+            self._capture_capacity = max_chunks * self._chunk_samples
+            self._capture_buffer = np.empty(self._capture_capacity, dtype=np.int16)
+            self._captured_samples = 0
+            
+            # Obter o PyAudio compartilhado (inicializado uma única vez) e abrir
+            # o stream em modo callback
+            self.audio = get_pyaudio()
             self.stream = self.audio.open(
                 format=FORMAT,
                 channels=self.channels,
                 rate=self.sample_rate,
                 input=True,
-                frames_per_buffer=CHUNK_SIZE
+                frames_per_buffer=CHUNK_SIZE,
+                stream_callback=self._audio_callback
             )
-            
-            # Variáveis de controle
-            is_speech_detected = False
-            self.recording_start_time = 0
-            self.silence_start_time = 0
-            frames = []
-            debug_info = {"rms_values": [], "timestamps": [], "states": []}
-            
-            # Calibração - usar a calibração existente ou fazer uma nova se necessário
-            if not self.is_calibrated:
-                self.calibrate_microphone()
-            else:
-                print(f"Usando calibração existente. Ruído ambiente: {self.ambient_noise_level:.1f}")
                 
             print("Aguardando você falar... (fale normalmente)")
             
-            # Loop principal de gravação
-            while not self.stop_event.is_set():
-                # Ler um chunk de áudio
-                data = self.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                
-                # Calcular nível de áudio
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                rms = self._calculate_rms(audio_data)
-                
-                # Adicionar dados de diagnóstico
-                current_time = time.time()
-                debug_info["rms_values"].append(rms)
-                debug_info["timestamps"].append(current_time)
-                
-                # Verificar se é fala ou silêncio
-                if rms > self.speech_threshold:
-                    # Detectou fala
-                    if not is_speech_detected:
-                        # Início da fala detectado
-                        is_speech_detected = True
-                        self.recording_start_time = time.time()
-                        print("Fala detectada! Gravando...")
-                        debug_info["states"].append("START_SPEECH")
-                    
-                    # Resetar o contador de silêncio
-                    self.silence_start_time = 0
-                    self.silent_chunks = 0
-                    
-                    # Armazenar o frame
-                    frames.append(data)
-                    debug_info["states"].append("SPEECH")
-                    
-                elif is_speech_detected:
-                    # Já estamos gravando, verificar se é silêncio
-                    if rms < self.silence_threshold:
-                        # É silêncio após fala
-                        if self.silence_start_time == 0:
-                            # Início do silêncio
-                            self.silence_start_time = time.time()
-                            debug_info["states"].append("START_SILENCE")
-                        else:
-                            # Continuação do silêncio
-                            debug_info["states"].append("SILENCE")
-                            
-                        # Incrementar contador de silêncio
-                        self.silent_chunks += 1
-                        
-                        # Verificar se já temos silêncio suficiente para parar
-                        silence_duration = time.time() - self.silence_start_time
-                        speech_duration = time.time() - self.recording_start_time
-                        
-                        if silence_duration >= self.min_silence_duration and speech_duration >= self.min_speech_duration:
-                            # Silêncio suficiente detectado após fala mínima
-                            print(f"Silêncio detectado após {speech_duration:.1f}s de fala. Finalizando gravação...")
-                            break
-                    else:
-                        # Ainda é fala (ou ruído), mas abaixo do threshold de fala
-                        self.silence_start_time = 0  # Resetar detecção de silêncio
-                        debug_info["states"].append("WEAK_SPEECH")
-                    
-                    # Armazenar o frame mesmo durante o silêncio
-                    frames.append(data)
-                    
-                    # Verificar se atingimos o tempo máximo de gravação
-                    if time.time() - self.recording_start_time >= self.max_speech_duration:
-                        print(f"Tempo máximo de gravação ({self.max_speech_duration}s) atingido. Finalizando...")
-                        break
-                else:
-                    # Ainda estamos em modo de espera (sem fala detectada)
-                    debug_info["states"].append("WAITING")
-                
-                # Pequena pausa para reduzir uso de CPU
-                time.sleep(0.001)
+            # Aguardar o fim da gravação, sinalizado pelo callback (fim da fala,
+            # duração máxima ou erro) ou por stop_recording
+            self.stop_event.wait()
             
             # Finalizar gravação
             self.stream.stop_stream()
             self.stream.close()
-            self.audio.terminate()
             self.stream = None
             self.audio = None
             
-            # Combinar todos os frames em um único buffer de áudio
-            audio_buffer = b''.join(frames)
+            # Copiar apenas o trecho gravado do buffer pré-alocado
+            captured_samples = self._captured_samples
+            chunk_samples = self._chunk_samples
+            audio_buffer = self._capture_buffer[:captured_samples].tobytes()
             
             # Calcular duração total
-            total_duration = len(frames) * CHUNK_SIZE / self.sample_rate
+            total_duration = captured_samples / chunk_samples * CHUNK_SIZE / self.sample_rate
             print(f"Gravação concluída. Duração: {total_duration:.2f}s")
             
             # Salvar dados de diagnóstico para debug
-            self.debug_queue.put(debug_info)
+            if self._collect_debug:
+                self.debug_queue.put(self._debug_info)
             
             # Se não tem dados suficientes, não enviar
-            if len(frames) < 3:  # Pelo menos 3 chunks (~60ms)
+            if captured_samples < 3 * chunk_samples:  # Pelo menos 3 chunks (~60ms)
                 print("Gravação muito curta. Ignorando.")
                 return
                 
@@ -361,14 +317,130 @@ class SmartRecorder:
                 except:
                     pass
                     
-            if self.audio:
-                try:
-                    self.audio.terminate()
-                except:
-                    pass
-                    
             self.is_recording = False
     
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        Callback do PortAudio, chamado em seu próprio thread a cada chunk gravado.
+        
+        Args:
+            in_data: Bytes do chunk capturado
+            frame_count: Número de frames no chunk
+            time_info: Informações de tempo do PortAudio
+            status: Flags de status do PortAudio
+            
+        Returns:
+            Tupla (dados de saída, flag de continuação) esperada pelo PyAudio
+        """
+        if self.stop_event.is_set():
+            return (None, pyaudio.paComplete)
+        
+        try:
+            finished = self._process_chunk(in_data)
+        except Exception as e:
+            logger.error(f"Erro no processamento do áudio gravado: {e}")
+            finished = True
+        
+        if finished:
+            # Acordar o thread de gravação para finalizar e entregar o áudio
+            self.stop_event.set()
+            return (None, pyaudio.paComplete)
+        
+        return (None, pyaudio.paContinue)
+    
+    def _process_chunk(self, data: bytes) -> bool:
+        """
+        Detecta fala e silêncio em um chunk e o armazena se a fala já começou.
+        
+        Args:
+            data: Bytes do chunk capturado
+            
+        Returns:
+            True se a gravação deve ser finalizada
+        """
+        add_state = self._add_state
+        chunk_samples = self._chunk_samples
+        chunk_callback = self._chunk_callback
+        
+        # Calcular nível de áudio
+        audio_data = np.frombuffer(data, dtype=np.int16)
+        rms = self._calculate_rms(audio_data)
+        
+        # Adicionar dados de diagnóstico
+        if self._collect_debug:
+            self._debug_info["rms_values"].append(rms)
+            self._debug_info["timestamps"].append(time.time())
+        
+        # Verificar se é fala ou silêncio
+        if rms > self.speech_threshold:
+            # Detectou fala
+            if not self._is_speech_detected:
+                # Início da fala detectado
+                self._is_speech_detected = True
+                self.recording_start_time = time.time()
+                print("Fala detectada! Gravando...")
+                add_state("START_SPEECH")
+            
+            # Resetar o contador de silêncio
+            self.silence_start_time = 0
+            self.silent_chunks = 0
+            
+            # Armazenar o frame
+            self._capture_buffer[self._captured_samples:self._captured_samples + chunk_samples] = audio_data
+            self._captured_samples += chunk_samples
+            if chunk_callback:
+                chunk_callback(data)
+            add_state("SPEECH")
+            
+        elif self._is_speech_detected:
+            # Já estamos gravando, verificar se é silêncio
+            if rms < self.silence_threshold:
+                # É silêncio após fala
+                if self.silence_start_time == 0:
+                    # Início do silêncio
+                    self.silence_start_time = time.time()
+                    add_state("START_SILENCE")
+                else:
+                    # Continuação do silêncio
+                    add_state("SILENCE")
+                    
+                # Incrementar contador de silêncio
+                self.silent_chunks += 1
+                
+                # Verificar se já temos silêncio suficiente para parar
+                silence_duration = time.time() - self.silence_start_time
+                speech_duration = time.time() - self.recording_start_time
+                
+                if silence_duration >= self.min_silence_duration and speech_duration >= self.min_speech_duration:
+                    # Silêncio suficiente detectado após fala mínima
+                    print(f"Silêncio detectado após {speech_duration:.1f}s de fala. Finalizando gravação...")
+                    return True
+            else:
+                # Ainda é fala (ou ruído), mas abaixo do threshold de fala
+                self.silence_start_time = 0  # Resetar detecção de silêncio
+                add_state("WEAK_SPEECH")
+            
+            # Armazenar o frame mesmo durante o silêncio
+            self._capture_buffer[self._captured_samples:self._captured_samples + chunk_samples] = audio_data
+            self._captured_samples += chunk_samples
+            if chunk_callback:
+                chunk_callback(data)
+            
+            # Verificar se atingimos o tempo máximo de gravação
+            if time.time() - self.recording_start_time >= self.max_speech_duration:
+                print(f"Tempo máximo de gravação ({self.max_speech_duration}s) atingido. Finalizando...")
+                return True
+        else:
+            # Ainda estamos em modo de espera (sem fala detectada)
+            add_state("WAITING")
+        
+        # Buffer cheio: a duração máxima foi atingida
+        if self._captured_samples >= self._capture_capacity:
+            print(f"Tempo máximo de gravação ({self.max_speech_duration}s) atingido. Finalizando...")
+            return True
+        
+        return False
+    
     def save_to_wav(self, filename: str, audio_data: bytes = None) -> None:
         """
         Salva os dados de áudio em um arquivo WAV.
@@ -399,7 +471,8 @@ class SmartRecorder:
         Obtém informações de diagnóstico da última gravação.
         
         Returns:
-            Dicionário com informações de diagnóstico
+            Dicionário com informações de diagnóstico, ou None se não houver
+            (os dados só são coletados com o log em nível DEBUG)
         """
         try:
             return self.debug_queue.get_nowait()
@@ -17,6 +17,8 @@ import asyncio
 import threading
 from typing import Optional, Callable
 
+from src.audio.portaudio import get_pyaudio
+
 # Configurar logger
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,7 @@ RATE = 16000  # Taxa de amostragem para detecção (16kHz é suficiente)
 CHUNK_SIZE = 1024
 SILENCE_THRESHOLD = 300  # Reduzido para melhor sensibilidade
 SILENCE_FRAMES = 20  # Quantos frames silenciosos para considerar como silêncio contínuo
+DETECTION_COOLDOWN = 7.0  # Pausa após detecção em segundos (tempo de gravação + margem)
 
 
 class VoiceDetector:
@@ -47,6 +50,7 @@ class VoiceDetector:
             chunk_size: Tamanho do chunk de áudio a ser processado por vez
         """
         self.threshold = threshold
+        self.threshold_sq = float(threshold) ** 2
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.is_running = False
@@ -54,13 +58,21 @@ class VoiceDetector:
         self.voice_detected_callback = None
         self.audio = None
         self.stream = None
+        self.silent_frames = 0
+        self.is_speaking = False
+        self.cooldown_until = 0.0
         
     def start_monitoring(self, callback: Optional[Callable] = None) -> None:
         """
-        Inicia o monitoramento do microfone em um thread separado.
+        Inicia o monitoramento do microfone.
+        
+        O stream é aberto em modo callback: o PortAudio entrega cada chunk em
+        seu próprio thread, onde a intensidade do áudio é avaliada, sem um
+        loop de leitura bloqueante.
         
         Args:
             callback: Função de callback chamada quando uma voz é detectada
+                     (executada no thread de áudio do PortAudio)
         """
         if self.is_running:
             logger.warning("Detector de voz já está em execução.")
@@ -68,13 +80,29 @@ class VoiceDetector:
             
         self.voice_detected_callback = callback
         self.stop_event.clear()
-        self.is_running = True
         
-        # Iniciar thread para monitoramento contínuo
-        self.monitor_thread = threading.Thread(target=self._monitor_audio)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        # Estado da detecção, atualizado pelo callback de áudio
+        self.silent_frames = 0
+        self.is_speaking = False
+        self.cooldown_until = 0.0
         
+        try:
+            # Abrir o stream em modo callback (PyAudio compartilhado)
+            self.audio = get_pyaudio()
+            self.stream = self.audio.open(
+                format=FORMAT,
+                channels=CHANNELS,
+                rate=self.sample_rate,
+                input=True,
+                frames_per_buffer=self.chunk_size,
+                stream_callback=self._audio_callback
+            )
+        except Exception as e:
+            logger.error(f"Erro no monitoramento de áudio: {e}")
+            self._close_stream()
+            return
+        
+        self.is_running = True
         logger.info("Detector de voz iniciado. Aguardando atividade de voz...")
         
     def stop_monitoring(self) -> None:
@@ -86,112 +114,81 @@ class VoiceDetector:
             
         self.stop_event.set()
         
-        # Aguardar o término do thread (com timeout)
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
-            
-        # Garantir que o stream e PyAudio sejam fechados
+        # Garantir que o stream seja fechado
+        self._close_stream()
+                
+        self.is_running = False
+        logger.info("Detector de voz parado.")
+        
+    def _close_stream(self) -> None:
+        """
+        Fecha o stream de áudio, ignorando erros.
+        
+        O PyAudio é compartilhado e finalizado apenas na saída do programa.
+        """
         if self.stream:
             try:
                 self.stream.stop_stream()
                 self.stream.close()
             except Exception as e:
                 logger.error(f"Erro ao fechar o stream: {e}")
+            self.stream = None
                 
-        if self.audio:
-            try:
-                self.audio.terminate()
-            except Exception as e:
-                logger.error(f"Erro ao terminar o PyAudio: {e}")
-                
-        self.is_running = False
-        logger.info("Detector de voz parado.")
+        self.audio = None
         
-    def _monitor_audio(self) -> None:
+    def _audio_callback(self, in_data, frame_count, time_info, status):
         """
-        Método privado que monitora continuamente o microfone.
+        Callback do PortAudio que avalia cada chunk capturado do microfone.
+        
+        Returns:
+            Tupla (dados de saída, flag de continuação) esperada pelo PyAudio
         """
+        if self.stop_event.is_set():
+            return (None, pyaudio.paComplete)
+        
         try:
-            # Inicializar PyAudio
-            self.audio = pyaudio.PyAudio()
-            self.stream = self.audio.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
-            )
+            # Ignorar o áudio durante a pausa após uma detecção
+            if time.monotonic() < self.cooldown_until:
+                return (None, pyaudio.paContinue)
             
-            # Contadores para detecção
-            silent_frames = 0
-            is_speaking = False
+            # Converter para array numpy
+            audio_data = np.frombuffer(in_data, dtype=np.int16)
             
-            # Loop principal de monitoramento
-            while not self.stop_event.is_set():
-                # Ler dados do microfone
-                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                
-                # Converter para array numpy
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                
-                # Calcular o valor RMS (raiz quadrada da média dos quadrados)
-                # como medida da intensidade do áudio
-                audio_squared = np.square(audio_data.astype(np.float32))
-                mean_squared = np.mean(audio_squared)
-                
-                # Evitar erro de raiz quadrada com números negativos
-                if mean_squared > 0:
-                    rms = np.sqrt(mean_squared)
-                else:
-                    rms = 0.0
+            # Média dos quadrados como medida da intensidade do áudio, numa
+            # única passada (sem temporários) e acumulada em float64. A raiz
+            # é monotônica, então a comparação é feita com o limiar ao quadrado
+            mean_squared = np.einsum('i,i->', audio_data, audio_data, dtype=np.float64) / audio_data.size
+            
+            # Detectar se há voz
+            if mean_squared > self.threshold_sq:
+                # Reiniciar contador de frames silenciosos
+                self.silent_frames = 0
                 
-                # Detectar se há voz
-                if rms > self.threshold:
-                    # Reiniciar contador de frames silenciosos
-                    silent_frames = 0
+                # Se não estava falando antes, sinalizar início de fala
+                if not self.is_speaking:
+                    self.is_speaking = True
+                    logger.debug("Voz detectada! (RMS: %.1f)", np.sqrt(mean_squared))
                     
-                    # Se não estava falando antes, sinalizar início de fala
-                    if not is_speaking:
-                        is_speaking = True
-                        logger.debug(f"Voz detectada! (RMS: {rms:.1f})")
+                    # Notificar através do callback
+                    if self.voice_detected_callback:
+                        self.voice_detected_callback()
                         
-                        # Notificar através do callback
-                        if self.voice_detected_callback:
-                            self.voice_detected_callback()
-                            
-                            # Após callback ser chamado, pausamos a detecção por um tempo
-                            # para evitar múltiplas detecções durante a gravação
-                            time.sleep(7)  # Pausa após detecção (tempo de gravação + margem)
-                            is_speaking = False
-                else:
-                    # Incrementar contador de frames silenciosos
-                    silent_frames += 1
-                    
-                    # Se tiver muitos frames silenciosos seguidos, resetar o estado
-                    if silent_frames > SILENCE_FRAMES:
-                        is_speaking = False
-                
-                # Pequena pausa para evitar uso excessivo de CPU
-                time.sleep(0.01)
+                        # Após callback ser chamado, pausamos a detecção por um tempo
+                        # para evitar múltiplas detecções durante a gravação
+                        self.cooldown_until = time.monotonic() + DETECTION_COOLDOWN
+                        self.is_speaking = False
+            else:
+                # Incrementar contador de frames silenciosos
+                self.silent_frames += 1
                 
+                # Se tiver muitos frames silenciosos seguidos, resetar o estado
+                if self.silent_frames > SILENCE_FRAMES:
+                    self.is_speaking = False
+                    
         except Exception as e:
             logger.error(f"Erro no monitoramento de áudio: {e}")
-        finally:
-            # Garantir limpeza dos recursos
-            if self.stream:
-                try:
-                    self.stream.stop_stream()
-                    self.stream.close()
-                except:
-                    pass
-                    
-            if self.audio:
-                try:
-                    self.audio.terminate()
-                except:
-                    pass
-                    
-            self.is_running = False
+        
+        return (None, pyaudio.paContinue)
 
 
 # Função auxiliar para criar e gerenciar o detector
@@ -235,5 +232,10 @@ async def test_voice_detection():
 
 
 if __name__ == "__main__":
+    from src.utils.event_loop import install_event_loop_policy
+    
+    # Usar o uvloop quando disponível, como na aplicação principal
+    install_event_loop_policy()
+    
     # Testar o detector
     asyncio.run(test_voice_detection())
@@ -13,13 +13,9 @@ Versão com reprodução em tempo real que:
 
 import asyncio
 import logging
-import os
 import sys
 import traceback
 
-# Adicionar o diretório raiz ao Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Configuração básica de logging
 logging.basicConfig(
     level=logging.WARNING,  # Reduzimos para WARNING para diminuir a verbosidade
@@ -34,6 +30,7 @@ try:
     
     # Importar módulo de configuração
     from src.utils.config import load_config
+    from src.utils.event_loop import install_event_loop_policy
     
     # Importar o detector de voz
     from src.audio.voice_detector import VoiceDetector
@@ -61,18 +58,22 @@ async def main_async():
     exit_requested = False
     voice_detected_event = asyncio.Event()
     
+    loop = asyncio.get_running_loop()
+    
     # Inicializar o SmartRecorder para o programa inteiro (para preservar calibração)
     print("Realizando calibração inicial do microfone (silêncio, por favor)...")
     global_recorder = SmartRecorder(sample_rate=16000)
-    global_recorder.calibrate_microphone()  # Fazer calibração apenas uma vez
+    # Fazer calibração apenas uma vez; as leituras bloqueantes do PortAudio
+    # rodam num thread do executor, fora do event loop
+    await loop.run_in_executor(None, global_recorder.calibrate_microphone)
     print("Calibração concluída. Sistema pronto para conversas!")
     
     # Inicializar o detector de voz
     voice_detector = VoiceDetector()
     
-    # Função de callback quando uma voz é detectada
+    # Função de callback quando uma voz é detectada (chamada no thread de áudio)
     def on_voice_detected():
-        voice_detected_event.set()
+        loop.call_soon_threadsafe(voice_detected_event.set)
     
     # Iniciar o detector de voz
     voice_detector.start_monitoring(on_voice_detected)
@@ -80,11 +81,11 @@ async def main_async():
     # Task para verificar entrada do teclado (para permitir sair do programa)
     async def check_keyboard_input():
         nonlocal exit_requested
+        loop = asyncio.get_running_loop()
         while not exit_requested:
             # Criar uma task para ler entrada não-bloqueante
             try:
                 # Aguardar por entrada do teclado com timeout
-                loop = asyncio.get_event_loop()
                 user_input = await loop.run_in_executor(None, lambda: input_with_timeout(0.5))
                 
                 if user_input and user_input.strip().lower() == 'sair':
@@ -193,6 +194,9 @@ def input_with_timeout(timeout=0.5):
 
 def main():
     """Função principal que inicia o assistente com reprodução em tempo real."""
+    # Usar uvloop quando disponível (mantém o event loop padrão no Windows)
+    install_event_loop_policy(config.get("runtime", {}).get("use_uvloop", True))
+    
     try:
         asyncio.run(main_async())
     except KeyboardInterrupt:
@@ -7,9 +7,12 @@ a partir de arquivos de configuração e variáveis de ambiente.
 """
 
 import json
+import logging
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 # Importação condicional para python-dotenv
 try:
@@ -18,11 +21,76 @@ try:
 except ImportError:
     HAS_DOTENV = False
 
+# Importação condicional para orjson (serialização JSON em C)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class RealtimeConfig:
+    """
+    Configurações usadas no fluxo de conversa com a API Realtime.
+    
+    Cópia imutável dos valores de `load_config`, lida uma única vez por
+    `get_realtime_config` e acessada por atributo, sem consultas aninhadas
+    ao dicionário de configuração a cada rodada.
+    """
+    api_key: Optional[str]
+    model: str
+    voice: str
+    personality: str
+    sample_rate: int
+    channels: int
+    chunk_size: int
+    output_device: Optional[Union[int, str]]
+    output_latency: Union[str, float]
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RealtimeConfig":
+        """
+        Cria a configuração a partir do dicionário retornado por `load_config`.
+        
+        Args:
+            config: Dicionário de configurações
+            
+        Returns:
+            Configuração da API Realtime
+        """
+        audio = config["audio"]
+        api = config["api"]
+        assistant = config["assistant"]
+        
+        return cls(
+            api_key=api.get("api_key"),
+            model=api["model"],
+            voice=assistant["voice"],
+            personality=assistant["personality"],
+            sample_rate=audio["sample_rate"],
+            channels=audio["channels"],
+            chunk_size=audio["chunk_size"],
+            output_device=audio.get("output_device"),
+            output_latency=audio.get("output_latency", "low"),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_realtime_config() -> RealtimeConfig:
+    """
+    Obtém a configuração da API Realtime, carregando-a na primeira chamada.
+    
+    Returns:
+        Configuração da API Realtime
+    """
+    return RealtimeConfig.from_config(load_config())
+
+
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Carrega configurações de arquivos e variáveis de ambiente.
@@ -40,6 +108,10 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
             "channels": 1,
             "format": "Int16",
             "chunk_size": 1024,
+            # Dispositivo de saída (índice ou nome do PortAudio, None = padrão)
+            # e latência do stream ("low", "high" ou segundos)
+            "output_device": None,
+            "output_latency": "low",
         },
         "api": {
             "model": "gpt-4o-realtime-preview",
@@ -57,6 +129,9 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
             ),
             "voice": "verse",
             "max_history": 10
+        },
+        "runtime": {
+            "use_uvloop": True,
         }
     }
     
@@ -70,7 +145,13 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     # Sobrescrever com variáveis de ambiente
     _override_with_env_vars(config)
     
-    logger.debug(f"Configuração carregada: {json.dumps(config, indent=2)}")
+    # Serializar a configuração apenas quando o log de debug estiver ativo
+    if logger.isEnabledFor(logging.DEBUG):
+        if HAS_ORJSON:
+            config_dump = orjson.dumps(config, option=orjson.OPT_INDENT_2).decode()
+        else:
+            config_dump = json.dumps(config, indent=2)
+        logger.debug("Configuração carregada: %s", config_dump)
     return config
 
 
@@ -113,6 +194,33 @@ def _load_config_file(config_path: str, config: Dict[str, Any]) -> None:
         logger.error(f"Erro ao carregar arquivo de configuração {config_path}: {e}")
 
 
+def _parse_device(value: str) -> Union[int, str]:
+    """
+    Converte o dispositivo de áudio informado em texto.
+    
+    Args:
+        value: Índice numérico ou nome (ou parte do nome) do dispositivo
+        
+    Returns:
+        Índice do dispositivo, ou o nome se não for numérico
+    """
+    return int(value) if value.strip().isdigit() else value
+
+
+def _parse_latency(value: str) -> Union[str, float]:
+    """
+    Converte a latência do stream de áudio informada em texto.
+    
+    Args:
+        value: "low", "high" ou a latência em segundos
+        
+    Returns:
+        A latência em segundos, ou o nome da latência sugerida
+    """
+    value = value.strip().lower()
+    return value if value in ("low", "high") else float(value)
+
+
 def _override_with_env_vars(config: Dict[str, Any]) -> None:
     """
     Sobrescreve configurações com variáveis de ambiente.
@@ -127,6 +235,8 @@ def _override_with_env_vars(config: Dict[str, Any]) -> None:
         "AUDIO_CHANNELS": ("audio", "channels", int),
         "AUDIO_FORMAT": ("audio", "format", str),
         "AUDIO_CHUNK_SIZE": ("audio", "chunk_size", int),
+        "AUDIO_OUTPUT_DEVICE": ("audio", "output_device", _parse_device),
+        "AUDIO_OUTPUT_LATENCY": ("audio", "output_latency", _parse_latency),
 
         # API
         "OPENAI_API_KEY": ("api", "api_key", str),
@@ -138,6 +248,9 @@ def _override_with_env_vars(config: Dict[str, Any]) -> None:
         "ASSISTANT_MAX_HISTORY": ("assistant", "max_history", int),
         "ASSISTANT_VOICE": ("assistant", "voice", str),
         "ASSISTANT_PERSONALITY": ("assistant", "personality", str),
+
+        # Execução
+        "USE_UVLOOP": ("runtime", "use_uvloop", bool),
     }
     
     for env_var, (section, key, type_func) in env_mappings.items():
@@ -0,0 +1,47 @@
+"""
+Configuração do event loop assíncrono para o assistente Turrão.
+
+Este módulo permite substituir o event loop padrão do asyncio pelo uvloop,
+que reduz o overhead de despacho de eventos no processamento contínuo das
+mensagens WebSocket da API Realtime.
+"""
+
+import asyncio
+
+# Importação condicional para uvloop (não disponível no Windows)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def install_event_loop_policy(use_uvloop: bool = True) -> bool:
+    """
+    Instala o uvloop como política de event loop do asyncio, se possível.
+
+    Deve ser chamada antes de qualquer `asyncio.run`. Quando o uvloop não está
+    instalado (por exemplo, no Windows) ou foi desabilitado na configuração,
+    o event loop padrão do asyncio é mantido.
+
+    Args:
+        use_uvloop: Se False, mantém o event loop padrão mesmo com uvloop disponível
+
+    Returns:
+        True se o uvloop foi instalado, False caso contrário
+    """
+    if not use_uvloop:
+        logger.debug("uvloop desabilitado na configuração. Usando o event loop padrão.")
+        return False
+
+    if not HAS_UVLOOP:
+        logger.debug("uvloop não está instalado. Usando o event loop padrão.")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("uvloop instalado como event loop do asyncio")
+    return True
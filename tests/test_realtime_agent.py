@@ -0,0 +1,160 @@
+"""
+Testes da rodada de conversa com a API Realtime, usando uma conexão falsa.
+
+A conexão falsa expõe apenas os métodos da `AsyncRealtimeConnection` do SDK
+(`recv`, `recv_bytes`, `send`, `close` e `parse_event`), de modo que qualquer
+chamada a um método inexistente falha com AttributeError.
+"""
+
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+from src.api import openai_client, realtime_agent
+
+# Áudio gravado e áudio da resposta usados nos testes
+RECORDED_CHUNKS = [bytes([i]) * 2048 for i in range(1, 6)]
+RESPONSE_AUDIO = b"\x10\x00" * 480
+
+
+class FakeRealtimeConnection:
+    """Conexão Realtime falsa, com o mesmo conjunto de métodos do SDK."""
+
+    __slots__ = ("sent", "_frames")
+
+    def __init__(self):
+        self.sent = []
+        self._frames = asyncio.Queue()
+
+    async def recv(self):
+        return self.parse_event(await self.recv_bytes())
+
+    async def recv_bytes(self):
+        return await self._frames.get()
+
+    async def send(self, event):
+        # Como o SDK, serializar o evento antes de "enviá-lo"
+        event = json.loads(json.dumps(event))
+        self.sent.append(event)
+
+        # Responder ao pedido de resposta com um delta de áudio e o fim da resposta
+        if event["type"] == "response.create":
+            self._frames.put_nowait(json.dumps({
+                "type": "response.audio.delta",
+                "item_id": "item_1",
+                "delta": base64.b64encode(RESPONSE_AUDIO).decode("ascii"),
+            }, separators=(",", ":")).encode())
+            self._frames.put_nowait(b'{"type":"response.done"}')
+
+    async def close(self):
+        pass
+
+    def parse_event(self, frame):
+        return SimpleNamespace(**json.loads(frame))
+
+
+class _FakeConnectionManager:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self.connection
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def _fake_client(connection):
+    connect = lambda model: _FakeConnectionManager(connection)
+    return SimpleNamespace(beta=SimpleNamespace(realtime=SimpleNamespace(connect=connect)))
+
+
+class FakeRecorder:
+    """Gravador falso que entrega os chunks gravados de uma só vez."""
+
+    def start_recording(self, on_complete, on_chunk):
+        for chunk in RECORDED_CHUNKS:
+            on_chunk(chunk)
+        on_complete(b"".join(RECORDED_CHUNKS))
+
+    def stop_recording(self):
+        pass
+
+
+class FakePlayer:
+    """Reprodutor falso que considera o áudio tocado assim que é recebido."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def add_audio_chunk(self, audio_bytes):
+        self.chunks.append(audio_bytes)
+
+    def mark_input_complete(self):
+        pass
+
+    def reset_frame_count(self):
+        pass
+
+    def set_playback_complete_callback(self, callback):
+        if callback is not None:
+            callback()
+
+    def stop_playback(self):
+        pass
+
+
+def _config():
+    return SimpleNamespace(api_key="sk-test", model="gpt-4o-realtime-preview",
+                           personality="Teste", voice="alloy",
+                           sample_rate=16000, channels=1)
+
+
+def _appended_audio(sent):
+    return b"".join(base64.b64decode(event["audio"])
+                    for event in sent if event["type"] == "input_audio_buffer.append")
+
+
+def test_process_audio_request_sends_through_connection_send(monkeypatch):
+    connection = FakeRealtimeConnection()
+    player = FakePlayer()
+    monkeypatch.setattr(realtime_agent, "get_realtime_config", _config)
+    monkeypatch.setattr(realtime_agent, "_get_audio_player", lambda config: player)
+    monkeypatch.setattr(realtime_agent, "get_async_openai", lambda api_key: _fake_client(connection))
+
+    result = asyncio.run(realtime_agent.process_audio_request(FakeRecorder()))
+
+    assert result["success"] is True
+    types = [event["type"] for event in connection.sent]
+    assert types[0] == "session.update"
+    assert types[-2:] == ["input_audio_buffer.commit", "response.create"]
+    assert set(types[1:-2]) == {"input_audio_buffer.append"}
+    assert _appended_audio(connection.sent) == b"".join(RECORDED_CHUNKS)
+    assert b"".join(player.chunks) == RESPONSE_AUDIO
+    assert result["total_audio_bytes"] == len(RESPONSE_AUDIO)
+
+
+def test_client_send_audio_and_request_response(monkeypatch):
+    connection = FakeRealtimeConnection()
+    monkeypatch.setattr(openai_client, "get_realtime_config", _config)
+    monkeypatch.setattr(openai_client, "get_async_openai", lambda api_key: _fake_client(connection))
+    audio = b"".join(RECORDED_CHUNKS)
+
+    async def turn():
+        client = openai_client.OpenAIRealtimeClient()
+        client.connection = connection
+        client.response_active = True
+        await client.configure_session("Teste")
+        await client.send_audio(audio, chunk_size=4096)
+        await client.request_response()
+        return await client.process_events()
+
+    result = asyncio.run(turn())
+
+    types = [event["type"] for event in connection.sent]
+    assert types[:2] == ["session.update", "response.cancel"]
+    assert types[-2:] == ["input_audio_buffer.commit", "response.create"]
+    assert _appended_audio(connection.sent) == audio
+    assert result["audio_chunks"] == 1
+    assert result["total_audio_bytes"] == len(RESPONSE_AUDIO)